@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+'''
+Benchmark of the Mopidy Pummeluff registry, which measures the load time and
+the memory footprint of a large registry, before and after all tags are
+hydrated into action instances.
+
+Usage::
+
+    python3 benchmarks/registry.py --tags 100000
+'''
+
+import json
+import os
+import sys
+import tracemalloc
+from argparse import ArgumentParser
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mopidy_pummeluff.registry import RegistryDict  # noqa: E402 pylint: disable=wrong-import-position
+
+#: The actions and parameters of the generated tags.
+TEMPLATES = (
+    ('Tracklist', 'spotify:playlist:37i9dQZF1DX4WYpdgoIcn6'),
+    ('Volume', '40'),
+    ('PlayPause', None),
+    ('VolumeUp', '5'),
+    ('Macro', 'Volume:30; ToggleShuffle; Tracklist:file:///music/audiobook'),
+)
+
+
+def generate(path, count):
+    '''
+    Generate a registry file.
+
+    :param str path: The path of the registry file
+    :param int count: The number of tags
+    '''
+    tags = []
+
+    for index in range(count):
+        action, parameter = TEMPLATES[index % len(TEMPLATES)]
+        tags.append({
+            'action': action,
+            'uid': f'{index:014X}',
+            'alias': f'Tag {index}',
+            'parameter': parameter or '',
+        })
+
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(tags, file)
+
+
+def measure(function):
+    '''
+    Measure the run time and the allocated memory of a function.
+
+    :param callable function: The function
+
+    :return: The result, the seconds and the allocated bytes
+    :rtype: tuple
+    '''
+    before  = tracemalloc.get_traced_memory()[0]
+    started = perf_counter()
+    result  = function()
+    elapsed = perf_counter() - started
+
+    return result, elapsed, tracemalloc.get_traced_memory()[0] - before
+
+
+def main():
+    '''
+    Run the benchmark.
+    '''
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tags', type=int, default=100000, help='the number of tags')
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as directory:
+        registry = RegistryDict(os.path.join(directory, 'tags.json'))
+        generate(registry.registry_path, args.tags)
+
+        tracemalloc.start()
+
+        _, load_time, load_memory       = measure(registry.open)
+        key                             = next(iter(registry))
+        _, lookup_time, _               = measure(lambda: registry.lookup(key))
+        _, hydrate_time, hydrate_memory = measure(registry.all_actions)
+
+        tracemalloc.stop()
+
+    print(f'Tags:                 {args.tags}')
+    print(f'Load time:            {load_time * 1000:.1f} ms')
+    print(f'Load memory:          {load_memory / 1024 / 1024:.1f} MiB')
+    print(f'First lookup time:    {lookup_time * 1000:.3f} ms')
+    print(f'Hydration time (all): {hydrate_time * 1000:.1f} ms')
+    print(f'Hydration memory:     {hydrate_memory / 1024 / 1024:.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+'''
+Benchmark of the Mopidy Pummeluff import time, which measures how long it
+takes to import the extension and to load its config schema (e.g. for
+``mopidy config``), and which heavy modules are imported by that.
+
+Usage::
+
+    python3 benchmarks/startup.py --runs 10
+'''
+
+import json
+import os
+import subprocess
+import sys
+from argparse import ArgumentParser
+from statistics import median
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+#: Modules which must not be imported before the frontend is started.
+HEAVY_MODULES = (
+    'RPi',
+    'pirc522',
+    'gpiod',
+    'evdev',
+    'gi',
+    'tornado',
+    'mopidy_pummeluff.registry',
+    'mopidy_pummeluff.threads',
+    'mopidy_pummeluff.web',
+)
+
+#: The code which is measured in a fresh interpreter.
+PROBE = '''
+import json, sys, time
+started = time.perf_counter()
+import mopidy_pummeluff
+imported = time.perf_counter()
+extension = mopidy_pummeluff.Extension()
+extension.get_config_schema()
+extension.get_default_config()
+configured = time.perf_counter()
+print(json.dumps({
+    'import': imported - started,
+    'config': configured - imported,
+    'modules': [name for name in %r if name in sys.modules],
+}))
+''' % (HEAVY_MODULES,)
+
+
+def probe():
+    '''
+    Run the probe in a fresh interpreter.
+
+    :return: The measurements
+    :rtype: dict
+    '''
+    output = subprocess.check_output([sys.executable, '-c', PROBE], cwd=ROOT)
+    return json.loads(output)
+
+
+def main():
+    '''
+    Run the benchmark.
+    '''
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10, help='the number of runs')
+    args = parser.parse_args()
+
+    results = [probe() for _ in range(args.runs)]
+    modules = sorted({name for result in results for name in result['modules']})
+
+    print(f'Runs:          {args.runs}')
+    print(f'Import time:   {median(result["import"] for result in results) * 1000:.1f} ms (median)')
+    print(f'Config time:   {median(result["config"] for result in results) * 1000:.1f} ms (median)')
+    print(f'Heavy modules: {", ".join(modules) or "none"}')
+
+    if modules:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,14 +3,19 @@ Mopidy Pummeluff Python module.
 '''
 
 import os
+from importlib.metadata import PackageNotFoundError, version
 
-import mopidy
-import pkg_resources
+import mopidy.config
+import mopidy.ext
 
-from .frontend import PummeluffFrontend
-from .web import ActionsHandler, LatestHandler, RegisterHandler, RegistryHandler, UnregisterHandler
+try:
+    __version__ = version('Mopidy-Pummeluff')
+except PackageNotFoundError:
+    # Not installed, e.g. when running from a source checkout.
+    __version__ = 'unknown'
 
-__version__ = pkg_resources.get_distribution('Mopidy-Pummeluff').version
+#: The number of configurable ``button_<n>`` bindings.
+BUTTONS = 16
 
 
 def app_factory(config, core):  # pylint: disable=unused-argument
@@ -23,12 +28,23 @@ def app_factory(config, core):  # pylint: disable=unused-argument
     :return: The registered app request handlers
     :rtype: list
     '''
+    # The web module is imported lazily, because it pulls in the registry and
+    # the threads, which aren't required to e.g. just show the config.
+    from .web import (ActionsHandler, EventsHandler, ExportHandler,  # pylint: disable=import-outside-toplevel
+                      HistoryHandler, ImportHandler, LatestHandler, RegisterHandler,
+                      RegistryHandler, StatusHandler, UnregisterHandler)
+
     return [
         ('/latest/', LatestHandler),
         ('/registry/', RegistryHandler),
         ('/register/', RegisterHandler),
         ('/unregister/', UnregisterHandler),
         ('/actions/', ActionsHandler),
+        ('/status/', StatusHandler),
+        ('/import/', ImportHandler),
+        ('/export/', ExportHandler),
+        ('/events/', EventsHandler),
+        ('/history/', HistoryHandler),
     ]
 
 
@@ -59,8 +75,49 @@ class Extension(mopidy.ext.Extension):
         :rtype: mopidy.config.schemas.ConfigSchema
         '''
         schema = super().get_config_schema()
-        for pin in ('led', 'shutdown', 'play_pause', 'stop', 'previous_track', 'next_track'):
-            schema[f'{pin}_pin'] = mopidy.config.Integer()
+        schema['led_pin'] = mopidy.config.Integer()
+        for pin in ('shutdown', 'play_pause', 'stop', 'previous_track', 'next_track'):
+            schema[f'{pin}_pin'] = mopidy.config.Integer(optional=True)
+        for number in range(1, BUTTONS + 1):
+            schema[f'button_{number}'] = mopidy.config.String(optional=True)
+
+        schema['registry_path']        = mopidy.config.Path()
+        schema['sound_backend']        = mopidy.config.String(choices=('auto', 'alsa', 'aplay', 'null'))
+        schema['dispatch_queue_size']  = mopidy.config.Integer(minimum=1)
+        schema['cache_playlist_items'] = mopidy.config.Boolean()
+        schema['warmup']               = mopidy.config.Boolean()
+        schema['warmup_ttl']           = mopidy.config.Integer(minimum=1)
+        schema['warmup_batch_size']    = mopidy.config.Integer(minimum=1)
+        schema['history_size']         = mopidy.config.Integer(minimum=1)
+        schema['reader']               = mopidy.config.String(choices=('mfrc522', 'hid', 'simulated'))
+        schema['reader_mode']          = mopidy.config.String(choices=('irq', 'poll'))
+        schema['reader_poll_interval'] = mopidy.config.Integer(minimum=1)
+        schema['reader_retries']       = mopidy.config.Integer(minimum=0)
+        schema['reader_backoff']       = mopidy.config.Integer(minimum=0)
+        schema['reader_spi_speed']     = mopidy.config.Integer(minimum=1)
+        schema['reader_device']        = mopidy.config.String(optional=True)
+        schema['simulated_uids']       = mopidy.config.List(optional=True)
+        schema['simulated_rate']       = mopidy.config.Integer(minimum=0)
+        schema['tag_debounce']         = mopidy.config.Integer(minimum=0)
+        schema['tag_repeat']           = mopidy.config.Integer(minimum=0)
+        schema['button_debounce']      = mopidy.config.Integer(minimum=0)
+        schema['button_repeat']        = mopidy.config.Integer(minimum=0)
+        schema['button_long_press']    = mopidy.config.Integer(minimum=1)
+        schema['button_double_click']  = mopidy.config.Integer(minimum=1)
+        schema['gpio']                 = mopidy.config.String(choices=('rpi', 'gpiod', 'fake'))
+        schema['gpio_chip']            = mopidy.config.String(optional=True)
+        schema['gpio_edge']            = mopidy.config.String(choices=('falling', 'rising', 'both'))
+        schema['gpio_bouncetime']      = mopidy.config.Integer(minimum=0)
+        schema['gpio_pins']            = mopidy.config.List(optional=True)
+
+        schema['resume']                = mopidy.config.Boolean()
+        schema['resume_flush_interval'] = mopidy.config.Integer(minimum=1)
+        schema['resume_path']           = mopidy.config.Path()
+        schema['rescan_policy']         = mopidy.config.String(choices=('resume', 'restart', 'next'))
+
+        schema['progressive_load']  = mopidy.config.Boolean()
+        schema['progressive_head']  = mopidy.config.Integer(minimum=1)
+        schema['progressive_batch'] = mopidy.config.Integer(minimum=1)
 
         return schema
 
@@ -70,6 +127,8 @@ class Extension(mopidy.ext.Extension):
 
         :param mopidy.ext.Registry registry: The mopidy registry
         '''
+        from .frontend import PummeluffFrontend  # pylint: disable=import-outside-toplevel
+
         registry.add('frontend', PummeluffFrontend)
 
         registry.add('http:static', {
@@ -11,13 +11,33 @@ __all__ = (
     'Tracklist',
     'ToggleShuffle',
     'Volume',
+    'VolumeUp',
+    'VolumeDown',
+    'Macro',
+    'Action',
+    'ActionCatalog',
+    'CATALOG',
 )
 
+from .base import Action
+from .catalog import ActionCatalog
+from .macro import Macro
 from .playback import NextTrack, PlayPause, PreviousTrack, Stop
 from .shutdown import Shutdown
 from .tracklist import ToggleShuffle, Tracklist
-from .volume import Volume
+from .volume import Volume, VolumeDown, VolumeUp
 
-ACTIONS = {}
-for action in __all__:
-    ACTIONS[action] = globals()[action].__doc__.strip()
+#: The catalog of the built-in and third-party actions.
+CATALOG = ActionCatalog((
+    PlayPause,
+    Stop,
+    PreviousTrack,
+    NextTrack,
+    Shutdown,
+    Tracklist,
+    ToggleShuffle,
+    Volume,
+    VolumeUp,
+    VolumeDown,
+    Macro,
+))
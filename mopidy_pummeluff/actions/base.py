@@ -3,26 +3,97 @@ Python module for Mopidy Pummeluff base action.
 '''
 
 __all__ = (
+    'ActionMetadata',
+    'inspect_action',
     'Action',
 )
 
+from collections import namedtuple
 from inspect import getfullargspec
 from logging import getLogger
 
+from .schema import Text
+
 LOGGER = getLogger(__name__)
 
+#: The metadata of an action class, which is computed once when the class is
+#: defined.
+ActionMetadata = namedtuple('ActionMetadata', ('name', 'description', 'parameter', 'required', 'default', 'schema'))
+
+
+def inspect_action(action_class):
+    '''
+    Compute the metadata of an action class from its docstring and the
+    signature of its :py:meth:`~Action.execute` method.
+
+    The action has a parameter, when :py:meth:`~Action.execute` has a
+    positional argument besides the core. The parameter is optional, when
+    the argument has a default value.
+
+    :param type action_class: The action class
+
+    :return: The metadata
+    :rtype: ActionMetadata
+    '''
+    spec     = getfullargspec(action_class.execute)
+    args     = spec.args[2:]
+    defaults = spec.defaults or ()
+
+    return ActionMetadata(
+        name=action_class.__name__,
+        description=' '.join((action_class.__doc__ or '').split()),
+        parameter=args[0] if args else None,
+        required=bool(args) and not defaults,
+        default=defaults[0] if args and defaults else None,
+        schema=action_class.schema if args else None,
+    )
+
 
 class Action:
     '''
     Base RFID tag class, which will implement the factory pattern in Python's
     own :py:meth:`__new__` method.
+
+    Actions use ``__slots__`` to keep the instances of large registries
+    compact, thus subclasses should define (empty) ``__slots__`` as well.
     '''
 
+    __slots__ = ('uid', 'alias', 'parameter', 'value', 'scanned')
+
+    #: Pending executions of the same action class can be replaced by a newer
+    #: one, because only the latest execution matters.
+    coalesce = False
+
+    #: The core state which is read by the action (see :py:meth:`prefetch`).
+    reads = ()
+
+    #: The core state which is changed by the action.
+    writes = ()
+
+    #: The schema of the parameter (see :py:mod:`mopidy_pummeluff.actions.schema`).
+    schema = Text()
+
+    #: The metadata of the action class (see :py:func:`inspect_action`).
+    metadata = None
+
+    def __init_subclass__(cls, **kwargs):
+        '''
+        Compute the metadata of every action class once.
+
+        :param dict \\**kwargs: The keyword arguments
+        '''
+        super().__init_subclass__(**kwargs)
+        cls.metadata = inspect_action(cls)
+
     @classmethod
     def execute(cls, core):  # pylint: disable=unused-argument
         '''
         Execute the action.
 
+        The method can return the futures of the core calls it issued without
+        waiting for them, so that the caller can wait for all of them at
+        once.
+
         :param mopidy.core.Core core: The mopidy core instance
 
         :raises NotImplementedError: When class method is not implemented
@@ -39,6 +110,7 @@ class Action:
         self.uid       = uid
         self.alias     = alias
         self.parameter = parameter
+        self.value     = None
         self.scanned   = None
 
     def __str__(self):
@@ -60,17 +132,67 @@ class Action:
         identifier = self.alias or self.uid
         return f'<{self.__class__.__name__} {identifier}>'
 
-    def __call__(self, core):
+    @classmethod
+    def prefetch(cls, core):  # pylint: disable=unused-argument
+        '''
+        Request the core state which is read by the action (see
+        :py:attr:`reads`), without waiting for it.
+
+        The resolved values are passed as keyword arguments to
+        :py:meth:`execute`, which requests the state by itself otherwise.
+
+        :param mopidy.core.Core core: The mopidy core instance
+
+        :return: The futures by keyword argument
+        :rtype: dict
+        '''
+        return {}
+
+    def __call__(self, core, **prefetched):
         '''
         Action method which is called when the tag is detected on the RFID
         reader.
 
         :param mopidy.core.Core core: The mopidy core instance
+        :param dict \\**prefetched: The prefetched core state
+
+        :return: The futures returned by :py:meth:`execute`
         '''
         args = [core]
         if self.parameter:
-            args.append(self.parameter)
-        self.execute(*args)
+            args.append(self.value if self.value is not None else self.parse())
+        return self.execute(*args, **prefetched)
+
+    @classmethod
+    def find_targets(cls, value):  # pylint: disable=unused-argument
+        '''
+        Return the URIs which are targeted by a parsed parameter, and thus
+        can be resolved in advance.
+
+        :param value: The parsed parameter
+
+        :return: The target URIs
+        :rtype: tuple
+        '''
+        return ()
+
+    @property
+    def targets(self):
+        '''
+        The URIs which are targeted by the action (see :py:meth:`find_targets`).
+
+        :return: The target URIs
+        :rtype: tuple
+        '''
+        if not self.parameter:
+            return ()
+
+        try:
+            value = self.value if self.value is not None else self.parse()
+        except ValueError:
+            return ()
+
+        return self.find_targets(value)
 
     def as_dict(self, include_scanned=False):
         '''
@@ -93,16 +215,35 @@ class Action:
 
         return data
 
+    def parse(self):
+        '''
+        Parse the parameter with the :py:attr:`schema` of the action, and
+        keep the parsed value, so that it's passed to :py:meth:`execute`
+        without parsing it again.
+
+        :return: The parsed parameter or ``None``
+
+        :raises ValueError: When parameter is invalid
+        '''
+        self.value = self.schema.parse(self.parameter) if self.parameter else None
+        return self.value
+
     def validate(self):
         '''
-        Validate parameter.
+        Validate and parse parameter.
+
+        A parameter is optional, when the parameter of the :py:meth:`execute`
+        method has a default value (see :py:attr:`metadata`).
 
-        :raises ValueError: When parameter is not allowed but defined
+        :raises ValueError: When parameter is not allowed but defined, or
+            when it's invalid
         '''
-        parameterised = len(getfullargspec(self.execute).args) > 2
+        metadata = self.metadata
 
-        if parameterised and not self.parameter:
+        if metadata.required and not self.parameter:
             raise ValueError('Parameter required for this tag')
 
-        if not parameterised and self.parameter:
+        if metadata.parameter is None and self.parameter:
             raise ValueError('No parameter allowed for this tag')
+
+        self.parse()
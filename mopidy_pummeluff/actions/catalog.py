@@ -0,0 +1,204 @@
+'''
+Python module for the Mopidy Pummeluff action catalog.
+'''
+
+__all__ = (
+    'ENTRY_POINT_GROUP',
+    'ActionCatalog',
+)
+
+from importlib.metadata import entry_points
+from logging import getLogger
+from threading import Lock
+
+from .base import Action
+
+LOGGER = getLogger(__name__)
+
+#: The entry point group of third-party actions.
+ENTRY_POINT_GROUP = 'mopidy_pummeluff.actions'
+
+
+def find_entry_points(group):
+    '''
+    Return the entry points of a group.
+
+    :param str group: The entry point group
+
+    :return: The entry points
+    :rtype: list[importlib.metadata.EntryPoint]
+    '''
+    try:
+        return list(entry_points(group=group))
+    except TypeError:
+        # Python < 3.10 doesn't support selecting entry points by group.
+        return list(entry_points().get(group, ()))
+
+
+class ActionCatalog:
+    '''
+    Catalog of all available action classes by their name.
+
+    The built-in actions are added when the catalog is created. Third-party
+    actions are discovered via the ``mopidy_pummeluff.actions`` entry point
+    group, where the name of an entry point is the name of the action, e.g.:
+
+    .. code-block:: python
+
+        entry_points={
+            'mopidy_pummeluff.actions': [
+                'MyAction = my_package.actions:MyAction',
+            ],
+        }
+
+    The entry points are discovered on the first lookup of an unknown action,
+    and each of them is only imported when it's looked up (or when all
+    actions are listed).
+    '''
+
+    def __init__(self, action_classes=()):
+        '''
+        Constructor.
+
+        :param iterable action_classes: The built-in action classes
+        '''
+        self.lock         = Lock()
+        self.classes      = {}
+        self.entry_points = None
+        self.cache        = None
+
+        for action_class in action_classes:
+            self.add(action_class)
+
+    def add(self, action_class, name=None):
+        '''
+        Add an action class to the catalog.
+
+        :param type action_class: The action class
+        :param str name: The name of the action, which defaults to the name
+            of the class
+
+        :raises ValueError: When it's not an action class
+        '''
+        if not isinstance(action_class, type) or not issubclass(action_class, Action):
+            raise ValueError(f'{action_class!r} is not an action class')
+
+        with self.lock:
+            self.classes[name or action_class.metadata.name] = action_class
+            self.cache = None
+
+    def discover(self):
+        '''
+        Discover the entry points of the third-party actions, if not done yet.
+
+        :return: The undiscovered entry points by action name
+        :rtype: dict
+        '''
+        with self.lock:
+            if self.entry_points is None:
+                self.entry_points = {}
+
+                for entry_point in find_entry_points(ENTRY_POINT_GROUP):
+                    if entry_point.name in self.classes:
+                        LOGGER.warning('Ignoring action %s of %s, because it already exists',
+                                       entry_point.name, entry_point.value)
+                        continue
+
+                    self.entry_points[entry_point.name] = entry_point
+
+            return self.entry_points
+
+    def load(self, name):
+        '''
+        Load the action class of an entry point.
+
+        :param str name: The name of the action
+
+        :return: The action class or ``None``
+        :rtype: type
+        '''
+        entry_point = self.discover().get(name)
+
+        if entry_point is None:
+            return None
+
+        try:
+            action_class = entry_point.load()
+            self.add(action_class, name)
+        except Exception as ex:  # pylint: disable=broad-except
+            LOGGER.error('Could not load action %s from %s: %s', name, entry_point.value, ex)
+            action_class = None
+
+        with self.lock:
+            self.entry_points.pop(name, None)
+
+        return action_class
+
+    def get(self, name):
+        '''
+        Return an action class by its name.
+
+        :param str name: The name of the action
+
+        :return: The action class
+        :rtype: type
+
+        :raises ValueError: When the action doesn't exist
+        '''
+        action_class = self.classes.get(name) or self.load(name)
+
+        if action_class is None:
+            raise ValueError(f'Action {name} not existing')
+
+        return action_class
+
+    def names(self):
+        '''
+        Return the names of all actions, including the undiscovered ones.
+
+        :return: The names of the actions
+        :rtype: list[str]
+        '''
+        return list(self.classes) + list(self.discover())
+
+    def as_dict(self):
+        '''
+        Dict representation of all actions, which is computed only once.
+
+        :return: The dict versions of the action metadata by action name
+        :rtype: dict
+        '''
+        for name in list(self.discover()):
+            self.load(name)
+
+        with self.lock:
+            if self.cache is None:
+                self.cache = {
+                    name: {
+                        'description': action_class.metadata.description,
+                        'parameter': self.describe_parameter(action_class.metadata),
+                    }
+                    for name, action_class in self.classes.items()
+                }
+
+            return self.cache
+
+    @staticmethod
+    def describe_parameter(metadata):
+        '''
+        Describe the parameter of an action.
+
+        :param ActionMetadata metadata: The action metadata
+
+        :return: The parameter description or ``None``
+        :rtype: dict
+        '''
+        if metadata.parameter is None:
+            return None
+
+        return {
+            'name': metadata.parameter,
+            'required': metadata.required,
+            'default': metadata.default,
+            'schema': metadata.schema.as_dict(),
+        }
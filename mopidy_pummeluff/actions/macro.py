@@ -0,0 +1,140 @@
+'''
+Python module for Mopidy Pummeluff macro tag.
+'''
+
+__all__ = (
+    'Step',
+    'Macro',
+)
+
+from logging import getLogger
+
+import pykka
+
+from mopidy_pummeluff import actions
+
+from .base import Action
+from .schema import List, Text
+
+LOGGER = getLogger(__name__)
+
+
+class Step(Text):
+    '''
+    Schema of a macro step, i.e. an action with an optional parameter
+    separated by ":" (e.g. ``Volume:30``), which is parsed into a validated
+    action instance.
+    '''
+
+    type = 'action'
+
+    #: The separator between the action and the parameter of a step.
+    SEPARATOR = ':'
+
+    def parse(self, value):
+        '''
+        Parse and validate a step.
+
+        :param str value: The raw step
+
+        :return: The action instance of the step
+        :rtype: actions.Action
+
+        :raises ValueError: When the step is invalid
+        '''
+        name, _, parameter = value.partition(self.SEPARATOR)
+        name               = name.strip()
+        action             = actions.CATALOG.get(name)
+
+        if issubclass(action, Macro):
+            raise ValueError('Macros can\'t be nested')
+
+        step = action(name, parameter=parameter.strip() or None)
+        step.validate()
+
+        return step
+
+    def as_dict(self):
+        '''
+        Dict representation of the schema.
+
+        :return: The dict version of the schema
+        :rtype: dict
+        '''
+        return {'type': self.type, 'separator': self.SEPARATOR}
+
+
+class Macro(Action):
+    '''
+    Execute multiple actions one after another. The tag's parameter contains
+    the steps separated by ";", each as action with an optional parameter
+    separated by ":" (e.g. "Volume:30; ToggleShuffle; Tracklist:file:///music").
+    '''
+
+    __slots__ = ()
+
+    schema = List(Step(), separator=';', maximum=16, label='Step')
+
+    @classmethod
+    def execute(cls, core, steps):  # pylint: disable=arguments-differ
+        '''
+        Execute the steps.
+
+        The core state which is read by the steps is requested at once up
+        front, unless it's changed by a previous step. The core calls of the
+        steps are issued without waiting for each of them, and waited for at
+        once at the end. Because Mopidy core handles its calls one after
+        another, the order of the steps is kept nevertheless.
+
+        :param mopidy.core.Core core: The mopidy core instance
+        :param list[actions.Action] steps: The parsed steps
+        '''
+        changed  = set()
+        requests = []
+
+        for step in steps:
+            if changed.isdisjoint(step.reads):
+                requests.append(step.prefetch(core))
+            else:
+                requests.append({})
+            changed.update(step.writes)
+
+        keys    = [(index, key) for index, request in enumerate(requests) for key in request]
+        values  = pykka.get_all([requests[index][key] for index, key in keys])
+        futures = []
+
+        for (index, key), value in zip(keys, values):
+            requests[index][key] = value
+
+        for step, prefetched in zip(steps, requests):
+            LOGGER.info('Executing macro step %r', step)
+            result = step(core, **prefetched)
+
+            if isinstance(result, pykka.Future):
+                futures.append(result)
+
+        pykka.get_all(futures)
+
+    @property
+    def steps(self):
+        '''
+        The parsed steps, which are parsed only once.
+
+        :return: The steps
+        :rtype: list[actions.Action]
+
+        :raises ValueError: When a step is invalid
+        '''
+        return self.value if self.value is not None else self.parse() or []
+
+    @classmethod
+    def find_targets(cls, value):
+        '''
+        Return the URIs which are targeted by the steps.
+
+        :param list[actions.Action] value: The parsed steps
+
+        :return: The target URIs
+        :rtype: tuple
+        '''
+        return tuple(uri for step in value for uri in step.targets)
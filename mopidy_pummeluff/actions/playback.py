@@ -21,21 +21,45 @@ class PlayPause(Action):
     Pause or resume the playback.
     '''
 
+    __slots__ = ()
+
+    reads  = ('playback',)
+    writes = ('playback',)
+
     @classmethod
-    def execute(cls, core):
+    def prefetch(cls, core):
+        '''
+        Request the playback state.
+
+        :param mopidy.core.Core core: The mopidy core instance
+
+        :return: The futures by keyword argument
+        :rtype: dict
+        '''
+        return {'state': core.playback.get_state()}
+
+    @classmethod
+    def execute(cls, core, *, state=None):  # pylint: disable=arguments-differ
         '''
         Pause or resume the playback.
 
         :param mopidy.core.Core core: The mopidy core instance
+        :param str state: The prefetched playback state
+
+        :return: The future of the core call
+        :rtype: pykka.Future
         '''
         playback = core.playback
 
-        if playback.get_state().get() == 'playing':
+        if state is None:
+            state = playback.get_state().get()
+
+        if state == 'playing':
             LOGGER.info('Pausing the playback')
-            playback.pause()
-        else:
-            LOGGER.info('Resuming the playback')
-            playback.resume()
+            return playback.pause()
+
+        LOGGER.info('Resuming the playback')
+        return playback.resume()
 
 
 class Stop(Action):
@@ -43,15 +67,23 @@ class Stop(Action):
     Stop the playback.
     '''
 
+    __slots__ = ()
+
+    coalesce = True
+    writes   = ('playback',)
+
     @classmethod
     def execute(cls, core):
         '''
         Stop playback.
 
         :param mopidy.core.Core core: The mopidy core instance
+
+        :return: The future of the core call
+        :rtype: pykka.Future
         '''
         LOGGER.info('Stopping playback')
-        core.playback.stop()
+        return core.playback.stop()
 
 
 class PreviousTrack(Action):
@@ -59,15 +91,23 @@ class PreviousTrack(Action):
     Change to the previous track.
     '''
 
+    __slots__ = ()
+
+    coalesce = True
+    writes   = ('playback',)
+
     @classmethod
     def execute(cls, core):
         '''
         Change to previous track.
 
         :param mopidy.core.Core core: The mopidy core instance
+
+        :return: The future of the core call
+        :rtype: pykka.Future
         '''
         LOGGER.info('Changing to previous track')
-        core.playback.previous()
+        return core.playback.previous()
 
 
 class NextTrack(Action):
@@ -75,12 +115,20 @@ class NextTrack(Action):
     Change to the next track.
     '''
 
+    __slots__ = ()
+
+    coalesce = True
+    writes   = ('playback',)
+
     @classmethod
     def execute(cls, core):
         '''
         Change to next track.
 
         :param mopidy.core.Core core: The mopidy core instance
+
+        :return: The future of the core call
+        :rtype: pykka.Future
         '''
         LOGGER.info('Changing to next track')
-        core.playback.next()
+        return core.playback.next()
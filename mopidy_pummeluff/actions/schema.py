@@ -0,0 +1,245 @@
+'''
+Python module for Mopidy Pummeluff action parameter schemas.
+'''
+
+__all__ = (
+    'Text',
+    'IntRange',
+    'URI',
+    'Enum',
+    'List',
+)
+
+import re
+
+
+class Text:
+    '''
+    Schema of a free text parameter, which is also the base class of all
+    parameter schemas.
+
+    A schema parses the raw parameter string of a tag into its native value
+    once (i.e. when the tag is registered or read), so that the action
+    doesn't have to parse it again on every scan.
+    '''
+
+    #: The type of the parameter, as exposed to the web UI.
+    type = 'text'
+
+    def parse(self, value):
+        '''
+        Parse and validate a parameter.
+
+        :param str value: The raw parameter
+
+        :return: The parsed parameter
+        :rtype: str
+
+        :raises ValueError: When the parameter is invalid
+        '''
+        return value.strip()
+
+    def as_dict(self):
+        '''
+        Dict representation of the schema.
+
+        :return: The dict version of the schema
+        :rtype: dict
+        '''
+        return {'type': self.type}
+
+
+class IntRange(Text):
+    '''
+    Schema of an integer parameter within a range.
+    '''
+
+    type = 'int'
+
+    def __init__(self, minimum, maximum, label='Parameter'):
+        '''
+        Constructor.
+
+        :param int minimum: The minimum value
+        :param int maximum: The maximum value
+        :param str label: The label of the parameter in error messages
+        '''
+        self.minimum = minimum
+        self.maximum = maximum
+        self.label   = label
+
+    def parse(self, value):
+        '''
+        Parse and validate an integer parameter.
+
+        :param str value: The raw parameter
+
+        :return: The parsed parameter
+        :rtype: int
+
+        :raises ValueError: When the parameter is invalid
+        '''
+        try:
+            number = int(value)
+            assert self.minimum <= number <= self.maximum
+        except (ValueError, AssertionError) as ex:
+            raise ValueError(f'{self.label} has to be a number between {self.minimum} and {self.maximum}') from ex
+
+        return number
+
+    def as_dict(self):
+        '''
+        Dict representation of the schema.
+
+        :return: The dict version of the schema
+        :rtype: dict
+        '''
+        return {'type': self.type, 'minimum': self.minimum, 'maximum': self.maximum, 'label': self.label}
+
+
+class URI(Text):
+    '''
+    Schema of a Mopidy URI parameter (e.g. ``spotify:playlist:…`` or
+    ``file:///…``).
+    '''
+
+    type = 'uri'
+
+    #: The pattern of an URI, i.e. a scheme followed by a colon.
+    PATTERN = r'^[A-Za-z][A-Za-z0-9+.-]*:\S+$'
+
+    def parse(self, value):
+        '''
+        Parse and validate an URI parameter.
+
+        :param str value: The raw parameter
+
+        :return: The parsed parameter
+        :rtype: str
+
+        :raises ValueError: When the parameter is invalid
+        '''
+        value = value.strip()
+
+        if not re.match(self.PATTERN, value):
+            raise ValueError(f'"{value}" is not a valid URI')
+
+        return value
+
+    def as_dict(self):
+        '''
+        Dict representation of the schema.
+
+        :return: The dict version of the schema
+        :rtype: dict
+        '''
+        return {'type': self.type, 'pattern': self.PATTERN}
+
+
+class Enum(Text):
+    '''
+    Schema of a parameter with predefined choices.
+    '''
+
+    type = 'enum'
+
+    def __init__(self, choices):
+        '''
+        Constructor.
+
+        :param iterable choices: The choices
+        '''
+        self.choices = tuple(choices)
+
+    def parse(self, value):
+        '''
+        Parse and validate an enum parameter.
+
+        :param str value: The raw parameter
+
+        :return: The parsed parameter
+        :rtype: str
+
+        :raises ValueError: When the parameter is invalid
+        '''
+        value = value.strip()
+
+        if value not in self.choices:
+            raise ValueError(f'Parameter has to be one of {", ".join(self.choices)}')
+
+        return value
+
+    def as_dict(self):
+        '''
+        Dict representation of the schema.
+
+        :return: The dict version of the schema
+        :rtype: dict
+        '''
+        return {'type': self.type, 'choices': list(self.choices)}
+
+
+class List(Text):
+    '''
+    Schema of a list parameter, where each item is parsed by another schema.
+    '''
+
+    type = 'list'
+
+    def __init__(self, item, separator=',', maximum=None, label='Item'):
+        '''
+        Constructor.
+
+        :param Text item: The schema of the items
+        :param str separator: The separator between the items
+        :param int maximum: The maximum number of items
+        :param str label: The label of the items in error messages
+        '''
+        self.item      = item
+        self.separator = separator
+        self.maximum   = maximum
+        self.label     = label
+
+    def parse(self, value):
+        '''
+        Parse and validate a list parameter. Empty items are ignored.
+
+        :param str value: The raw parameter
+
+        :return: The parsed parameter
+        :rtype: list
+
+        :raises ValueError: When the parameter is invalid
+        '''
+        items = [item for item in value.split(self.separator) if item.strip()]
+
+        if not items:
+            raise ValueError(f'Parameter requires at least one {self.label.lower()}')
+
+        if self.maximum is not None and len(items) > self.maximum:
+            raise ValueError(f'Parameter can\'t have more than {self.maximum} {self.label.lower()}s')
+
+        parsed = []
+
+        for index, item in enumerate(items, start=1):
+            try:
+                parsed.append(self.item.parse(item))
+            except ValueError as ex:
+                raise ValueError(f'{self.label} {index}: {ex}') from ex
+
+        return parsed
+
+    def as_dict(self):
+        '''
+        Dict representation of the schema.
+
+        :return: The dict version of the schema
+        :rtype: dict
+        '''
+        return {
+            'type': self.type,
+            'separator': self.separator,
+            'maximum': self.maximum,
+            'label': self.label,
+            'item': self.item.as_dict(),
+        }
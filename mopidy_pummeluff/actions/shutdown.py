@@ -19,6 +19,10 @@ class Shutdown(Action):
     Shut down the system.
     '''
 
+    __slots__ = ()
+
+    coalesce = True
+
     @classmethod
     def execute(cls, core):
         '''
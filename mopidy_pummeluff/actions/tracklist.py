@@ -8,8 +8,15 @@ __all__ = (
 )
 
 from logging import getLogger
+from random import randrange
+
+from mopidy_pummeluff.playlists import PLAYLISTS
+from mopidy_pummeluff.resume import LOADED, RESUME
+from mopidy_pummeluff.targets import TARGETS
+from mopidy_pummeluff.threads.tracklist_loader import TracklistLoader
 
 from .base import Action
+from .schema import URI
 
 LOGGER = getLogger(__name__)
 
@@ -19,26 +26,214 @@ class Tracklist(Action):
     Replace the tracklist with the URI of the tag's parameter.
     '''
 
+    __slots__ = ()
+
+    coalesce = True
+    writes   = ('tracklist', 'playback')
+    schema   = URI()
+
     @classmethod
     def execute(cls, core, uri):  # pylint: disable=arguments-differ
         '''
-        Replace tracklist and play.
+        Replace tracklist and play, respectively resume the playback at the
+        recorded position of the URI.
+
+        When the tracklist of the URI is still loaded, it isn't replaced, but
+        handled according to the rescan policy of the loaded tracklist (see
+        :py:class:`~mopidy_pummeluff.resume.LoadedTracklist`).
+
+        Long tracklists are loaded progressively, if enabled (see
+        :py:meth:`load_progressively`).
 
         :param mopidy.core.Core core: The mopidy core instance
         :param str uri: An URI for the tracklist replacement
         '''
+        uris = cls.resolve(core, uri)
+
+        if LOADED.is_loaded(uri, uris, core.tracklist.get_version().get()):
+            LOGGER.info('Tracklist of URI "%s" is already loaded, applying %s policy', uri, LOADED.policy)
+            LOADED.rescans += 1
+            cls.rescan(core, uri)
+            return
+
         LOGGER.info('Replacing tracklist with URI "%s"', uri)
 
-        playlists = [playlist.uri for playlist in core.playlists.as_list().get()]
+        TracklistLoader.cancel_current()
+        core.tracklist.clear()
+
+        if TracklistLoader.enabled and len(uris) > TracklistLoader.head:
+            cls.load_progressively(core, uri, uris)
+            return
+
+        tlids, _ = TracklistLoader.add(core, uris)
+        LOADED.set(uri, uris, tlids, core.tracklist.get_version().get())
+
+        cls.play(core, uri, tlids)
+
+    @classmethod
+    def load_progressively(cls, core, uri, uris):
+        '''
+        Load the first tracks and start the playback, while the remaining
+        tracks are loaded in the background by the
+        :py:class:`~mopidy_pummeluff.threads.TracklistLoader`.
+
+        The first tracks are the ones at the recorded position of the URI, a
+        random one in random mode, or the ones at the beginning.
+
+        :param mopidy.core.Core core: The mopidy core instance
+        :param str uri: An URI for the tracklist replacement
+        :param list[str] uris: The track URIs
+        '''
+        position = RESUME.get(uri)
+
+        if position is not None and position[0] < len(uris):
+            start = position[0]
+        elif core.tracklist.get_random().get():
+            start = randrange(len(uris))
+        else:
+            start = 0
+
+        head  = range(start, min(start + TracklistLoader.head, len(uris)))
+        tlids = [None] * len(uris)
+
+        tlids[head.start:head.stop], _ = TracklistLoader.add(core, uris[head.start:head.stop])
+
+        version = core.tracklist.get_version().get()
+        LOADED.set(uri, uris, tlids, version)
+
+        LOGGER.info('Loaded %d of %d tracks, loading the others in the background', len(head), len(uris))
+        cls.play(core, uri, tlids)
+
+        TracklistLoader.start_loading(core, uri, uris, tlids, version, head)
+
+    @staticmethod
+    def resolve(core, uri):
+        '''
+        Resolve the URI into track URIs.
+
+        :param mopidy.core.Core core: The mopidy core instance
+        :param str uri: The URI
+
+        :return: The track URIs
+        :rtype: list[str]
+        '''
+        uris = TARGETS.get(uri)
 
-        if uri in playlists:
-            uris = [item.uri for item in core.playlists.get_items(uri).get()]
+        if uris is not None:
+            LOGGER.debug('Using %d pre-resolved track URIs', len(uris))
+        elif PLAYLISTS.is_playlist(core, uri):
+            uris = PLAYLISTS.get_items(core, uri)
         else:
             uris = [uri]
 
-        core.tracklist.clear()
-        core.tracklist.add(uris=uris)
-        core.playback.play()
+        return uris
+
+    @classmethod
+    def rescan(cls, core, uri):
+        '''
+        Handle a rescan of the loaded tracklist according to the policy:
+
+        - ``resume``: Resume the paused or play the stopped playback at the
+          recorded position, while a running playback isn't touched.
+        - ``restart``: Play the tracklist from the beginning, which waits
+          until the beginning of a progressively loaded tracklist is loaded.
+        - ``next``: Skip to the next track.
+
+        :param mopidy.core.Core core: The mopidy core instance
+        :param str uri: The URI of the loaded tracklist
+        '''
+        policy = LOADED.policy
+
+        if policy == 'restart':
+            if LOADED.order[:1] == [None]:
+                # The tracks before the first loaded tracks are loaded last.
+                TracklistLoader.wait_current()
+
+            first, _ = cls.find_tlid(LOADED.order, 0, 0)
+
+            if first is not None:
+                core.playback.play(tlid=first)
+                return
+
+        state = core.playback.get_state().get()
+
+        if policy == 'next':
+            core.playback.next()
+            if state != 'playing':
+                core.playback.play()
+        elif state == 'paused':
+            core.playback.resume()
+        elif state == 'stopped':
+            cls.play(core, uri, LOADED.order)
+
+    @staticmethod
+    def find_tlid(tlids, index, offset):
+        '''
+        Find the tracklist ID of the track at a position.
+
+        When there's no track at the position (e.g. because the track URI is
+        unavailable), the next track is returned instead.
+
+        :param list[tuple] tlids: The tracklist IDs per track URI, which are
+            ``None`` for track URIs which aren't loaded yet
+        :param int index: The index of the track URI
+        :param int offset: The offset of the track within its track URI
+
+        :return: The tracklist ID or ``None``, and if it's the track at the
+            position
+        :rtype: tuple
+        '''
+        exact = True
+
+        while index < len(tlids) and tlids[index] is not None:
+            if offset < len(tlids[index]):
+                return tlids[index][offset], exact
+
+            index, offset, exact = index + 1, 0, False
+
+        return None, False
+
+    @classmethod
+    def play(cls, core, uri, tlids):
+        '''
+        Play the tracklist at the recorded position of the URI, or from the
+        beginning.
+
+        :param mopidy.core.Core core: The mopidy core instance
+        :param str uri: The URI of the tracklist
+        :param list[tuple] tlids: The tracklist IDs per track URI, which are
+            ``None`` for track URIs which aren't loaded yet
+        '''
+        position = RESUME.get(uri)
+
+        if position is None:
+            core.playback.play()
+            return
+
+        index, time_position, offset = position
+        tlid, exact = cls.find_tlid(tlids, index, offset)
+
+        if tlid is None:
+            core.playback.play()
+            return
+
+        LOGGER.info('Resuming track %d.%d at %dms', index + 1, offset + 1, time_position)
+        core.playback.play(tlid=tlid)
+
+        if time_position and exact:
+            core.playback.seek(time_position)
+
+    @classmethod
+    def find_targets(cls, value):
+        '''
+        Return the URI of the tag's parameter.
+
+        :param str value: The parsed URI
+
+        :return: The target URIs
+        :rtype: tuple
+        '''
+        return (value,)
 
 
 class ToggleShuffle(Action):
@@ -46,16 +241,38 @@ class ToggleShuffle(Action):
     Toggle random mode.
     '''
 
+    __slots__ = ()
+
+    reads  = ('random',)
+    writes = ('random',)
+
     @classmethod
-    def execute(cls, core):
+    def prefetch(cls, core):
+        '''
+        Request the random mode.
+
+        :param mopidy.core.Core core: The mopidy core instance
+
+        :return: The futures by keyword argument
+        :rtype: dict
+        '''
+        return {'shuffle': core.tracklist.get_random()}
+
+    @classmethod
+    def execute(cls, core, *, shuffle=None):  # pylint: disable=arguments-differ
         '''
         Toggle random mode.
 
         :param mopidy.core.Core core: The mopidy core instance
+        :param bool shuffle: The prefetched random mode
+
+        :return: The future of the core call
+        :rtype: pykka.Future
         '''
+        if shuffle is None:
+            shuffle = core.tracklist.get_random().get()
 
-        shuffle = core.tracklist.get_random().get()
         shuffle = not shuffle
-        core.tracklist.set_random(shuffle)
-
         LOGGER.info('Toggling shuffle mode [%s]', shuffle)
+
+        return core.tracklist.set_random(shuffle)
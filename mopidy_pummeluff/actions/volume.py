@@ -4,11 +4,16 @@ Python module for Mopidy Pummeluff volume tag.
 
 __all__ = (
     'Volume',
+    'VolumeUp',
+    'VolumeDown',
 )
 
 from logging import getLogger
 
+from mopidy_pummeluff.mixer import VOLUME
+
 from .base import Action
+from .schema import IntRange
 
 LOGGER = getLogger(__name__)
 
@@ -18,31 +23,57 @@ class Volume(Action):
     Set the volume to the percentage value from the tag's parameter.
     '''
 
+    __slots__ = ()
+
+    coalesce = True
+    writes   = ('mixer',)
+    schema   = IntRange(0, 100, label='Volume parameter')
+
     @classmethod
     def execute(cls, core, volume):  # pylint: disable=arguments-differ
         '''
         Set volume of the mixer.
 
         :param mopidy.core.Core core: The mopidy core instance
-        :param volume: The new (percentage) volume
-        :type volume: int|str
+        :param int volume: The new (percentage) volume
         '''
-        LOGGER.info('Setting volume to %s', volume)
-        try:
-            core.mixer.set_volume(int(volume))
-        except ValueError as ex:
-            LOGGER.error(str(ex))
+        VOLUME.set(core, volume)
 
-    def validate(self):
+
+class VolumeUp(Action):
+    '''
+    Increase the volume by the step from the tag's parameter (default 5).
+    '''
+
+    __slots__ = ()
+
+    writes = ('mixer',)
+    schema = IntRange(1, 100, label='Volume step')
+
+    @classmethod
+    def execute(cls, core, step=5):  # pylint: disable=arguments-differ
         '''
-        Validates if the parameter is an integer between 0 and 100.
+        Increase volume of the mixer.
 
-        :raises ValueError: When parameter is invalid
+        :param mopidy.core.Core core: The mopidy core instance
+        :param int step: The (percentage) step
         '''
-        super().validate()
+        VOLUME.step(core, step)
 
-        try:
-            number = int(self.parameter)
-            assert 0 <= number <= 100
-        except (ValueError, AssertionError) as ex:
-            raise ValueError('Volume parameter has to be a number between 0 and 100') from ex
+
+class VolumeDown(VolumeUp):
+    '''
+    Decrease the volume by the step from the tag's parameter (default 5).
+    '''
+
+    __slots__ = ()
+
+    @classmethod
+    def execute(cls, core, step=5):
+        '''
+        Decrease volume of the mixer.
+
+        :param mopidy.core.Core core: The mopidy core instance
+        :param int step: The (percentage) step
+        '''
+        VOLUME.step(core, -step)
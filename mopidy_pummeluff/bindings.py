@@ -0,0 +1,229 @@
+'''
+Python module for Mopidy Pummeluff button bindings.
+'''
+
+__all__ = (
+    'MODES',
+    'Binding',
+    'parse_binding',
+    'ButtonDecoder',
+)
+
+from collections import defaultdict, namedtuple
+
+from mopidy_pummeluff import actions
+
+#: The supported press modes of a binding.
+MODES = ('short', 'long', 'double')
+
+#: A binding of one or more button pins (i.e. a chord) and a press mode to an
+#: action.
+Binding = namedtuple('Binding', ('pins', 'action', 'mode'))
+
+
+def parse_binding(value, uid):
+    '''
+    Parse a binding in the format ``pins, action, parameter, mode``.
+
+    Multiple pins of a chord are joined by ``+`` (e.g. ``29+31``). The
+    parameter and the mode are optional, the mode defaults to ``short``.
+
+    :param str value: The binding
+    :param str uid: The UID of the action (i.e. the name of the config key)
+
+    :return: The binding
+    :rtype: Binding
+
+    :raises ValueError: When the binding is invalid
+    '''
+    parts = [part.strip() for part in value.split(',')]
+    mode  = 'short'
+
+    if len(parts) < 2:
+        raise ValueError(f'Binding "{value}" requires at least pins and action')
+
+    if len(parts) > 2 and parts[-1] in MODES:
+        mode = parts.pop()
+
+    try:
+        pins = frozenset(int(pin) for pin in parts[0].split('+'))
+    except ValueError as ex:
+        raise ValueError(f'Binding "{value}" has invalid pins') from ex
+
+    action = actions.CATALOG.get(parts[1])(uid, parameter=', '.join(parts[2:]) or None)
+    action.validate()
+
+    return Binding(pins, action, mode)
+
+
+class ButtonDecoder:
+    '''
+    Decoder which turns the pushes and releases of button pins into
+    triggered bindings.
+
+    The decoding is driven by the binding table, which is analysed once:
+
+    - Pins which are only bound to a single ``short`` binding (and aren't
+      part of a chord) trigger immediately when they're pushed.
+    - All other pushes are collected into a gesture until all of its pins
+      are released again. A gesture triggers its ``long`` binding when it's
+      held long enough, its ``double`` binding when it's released twice
+      within the double click time, or else its ``short`` binding.
+
+    All methods return the triggered bindings, which makes the decoder
+    independent of any GPIO backend or clock.
+    '''
+
+    def __init__(self, bindings, long_press=0.6, double_click=0.3):
+        '''
+        Constructor.
+
+        :param list[Binding] bindings: The bindings
+        :param float long_press: The duration of a long press in seconds
+        :param float double_click: The maximum time between two clicks of a
+            double click in seconds
+        '''
+        self.table        = {(binding.pins, binding.mode): binding for binding in bindings}
+        self.long_press   = long_press
+        self.double_click = double_click
+
+        modes   = defaultdict(set)
+        chorded = set()
+
+        for pins, mode in self.table:
+            modes[pins].add(mode)
+            if len(pins) > 1:
+                chorded |= pins
+
+        self.immediate = {
+            pin: self.table[(pins, 'short')]
+            for pins, pin_modes in modes.items()
+            for pin in pins
+            if len(pins) == 1 and pin_modes == {'short'} and pin not in chorded
+        }
+
+        self.pins         = set().union(*modes)
+        self.release_pins = self.pins - set(self.immediate)
+        self.pressed      = {}
+        self.gesture      = frozenset()
+        self.started      = None
+        self.consumed     = False
+        self.pending      = None
+
+    @property
+    def deadline(self):
+        '''
+        The next timestamp at which :py:meth:`poll` has to be called.
+
+        :return: The deadline or ``None``
+        :rtype: float
+        '''
+        deadlines = []
+
+        if self.pressed and not self.consumed and (self.gesture, 'long') in self.table:
+            deadlines.append(self.started + self.long_press)
+
+        if self.pending and self.pending[1] is not None:
+            deadlines.append(self.pending[1])
+
+        return min(deadlines, default=None)
+
+    def press(self, pin, now):
+        '''
+        Push a pin.
+
+        :param int pin: The pin number
+        :param float now: The monotonic timestamp
+
+        :return: The triggered bindings
+        :rtype: list[Binding]
+        '''
+        if pin in self.immediate:
+            return [self.immediate[pin]]
+
+        if pin not in self.pins:
+            return []
+
+        triggered = []
+
+        if self.pending:
+            if pin in self.pending[0]:
+                self.pending = (self.pending[0], None)
+            else:
+                triggered += self.flush()
+
+        if not self.pressed:
+            self.gesture  = frozenset()
+            self.started  = now
+            self.consumed = False
+
+        self.pressed[pin] = now
+        self.gesture     |= {pin}
+
+        return triggered
+
+    def release(self, pin, now):  # pylint: disable=unused-argument
+        '''
+        Release a pin.
+
+        :param int pin: The pin number
+        :param float now: The monotonic timestamp
+
+        :return: The triggered bindings
+        :rtype: list[Binding]
+        '''
+        if self.pressed.pop(pin, None) is None or self.pressed or self.consumed:
+            return []
+
+        pins      = self.gesture
+        triggered = []
+
+        if self.pending and self.pending[0] != pins:
+            triggered += self.flush()
+
+        if (pins, 'double') in self.table:
+            if self.pending:
+                self.pending = None
+                triggered.append(self.table[(pins, 'double')])
+            else:
+                self.pending = (pins, now + self.double_click)
+
+        elif (pins, 'short') in self.table:
+            triggered.append(self.table[(pins, 'short')])
+
+        return triggered
+
+    def poll(self, now):
+        '''
+        Trigger the bindings whose deadline has passed.
+
+        :param float now: The monotonic timestamp
+
+        :return: The triggered bindings
+        :rtype: list[Binding]
+        '''
+        triggered = []
+
+        if self.pressed and not self.consumed and now - self.started >= self.long_press:
+            binding = self.table.get((self.gesture, 'long'))
+            if binding:
+                self.consumed = True
+                triggered.append(binding)
+
+        if self.pending and self.pending[1] is not None and now >= self.pending[1]:
+            triggered += self.flush()
+
+        return triggered
+
+    def flush(self):
+        '''
+        Trigger the ``short`` binding of a pending click, which didn't become
+        a double click.
+
+        :return: The triggered bindings
+        :rtype: list[Binding]
+        '''
+        pins, _      = self.pending
+        self.pending = None
+        binding      = self.table.get((pins, 'short'))
+        return [binding] if binding else []
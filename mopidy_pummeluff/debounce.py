@@ -0,0 +1,119 @@
+'''
+Python module for Mopidy Pummeluff debouncing.
+'''
+
+__all__ = (
+    'Debouncer',
+    'DEBOUNCER',
+)
+
+from threading import Lock
+from time import monotonic
+
+
+class Debouncer:
+    '''
+    Debouncer which suppresses repeated events of the same key (e.g. the UID
+    of a tag or the pin of a button) per source.
+
+    An event is suppressed while the same key was already seen within the
+    window of its source, thus a key which is continuously seen (e.g. a tag
+    lying on the reader or a held button) is considered to be held. When a
+    repeat interval is configured for the source, held keys fire again in
+    that interval (e.g. for a held volume button).
+    '''
+
+    #: The number of keys per source, after which stale keys are pruned.
+    max_keys = 1024
+
+    def __init__(self):
+        '''
+        Constructor.
+        '''
+        self.lock    = Lock()
+        self.sources = {}
+
+    def configure(self, source, window, repeat=0):
+        '''
+        Configure a source, which also resets its state and counters.
+
+        :param str source: The source (e.g. ``tag`` or ``button``)
+        :param float window: The debounce window in seconds
+        :param float repeat: The repeat interval of held keys in seconds
+            (``0`` to disable repeats)
+        '''
+        with self.lock:
+            self.sources[source] = {
+                'window': window,
+                'repeat': repeat,
+                'keys': {},
+                'fired': 0,
+                'repeated': 0,
+                'suppressed': 0,
+            }
+
+    def fire(self, source, key, now=None):
+        '''
+        Register an event and check if it should fire.
+
+        :param str source: The source
+        :param key: The key (e.g. a UID or a pin)
+        :param float now: The monotonic timestamp of the event
+
+        :return: The event should fire
+        :rtype: bool
+
+        :raises KeyError: When source isn't configured
+        '''
+        if now is None:
+            now = monotonic()
+
+        with self.lock:
+            state  = self.sources[source]
+            window = state['window']
+            keys   = state['keys']
+
+            last_seen, last_fired = keys.get(key, (None, None))
+
+            if last_seen is None or now - last_seen >= window:
+                state['fired'] += 1
+                fired = True
+            elif state['repeat'] and now - last_fired >= state['repeat']:
+                state['repeated'] += 1
+                fired = True
+            else:
+                state['suppressed'] += 1
+                fired = False
+
+            keys[key] = (now, now if fired else last_fired)
+
+            if len(keys) > self.max_keys:
+                for stale in [k for k, (seen, _) in keys.items() if now - seen >= window]:
+                    del keys[stale]
+
+            return fired
+
+    def as_dict(self):
+        '''
+        Dict representation of the debouncer status.
+
+        :return: The dict version of the status
+        :rtype: dict
+        '''
+        with self.lock:
+            return {
+                source: {
+                    'window': state['window'],
+                    'repeat': state['repeat'],
+                    'keys': len(state['keys']),
+                    'fired': state['fired'],
+                    'repeated': state['repeated'],
+                    'suppressed': state['suppressed'],
+                }
+                for source, state in self.sources.items()
+            }
+
+
+DEBOUNCER = Debouncer()
+DEBOUNCER.configure('tag', window=1)
+DEBOUNCER.configure('button', window=0.25)
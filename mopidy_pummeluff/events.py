@@ -0,0 +1,70 @@
+'''
+Python module for Mopidy Pummeluff events.
+'''
+
+__all__ = (
+    'EventBus',
+    'EVENTS',
+)
+
+from logging import getLogger
+from threading import Lock
+
+LOGGER = getLogger(__name__)
+
+
+class EventBus:
+    '''
+    Class which delivers events (e.g. scanned tags or pushed buttons) to all
+    subscribers.
+
+    The subscribers are called in the thread which publishes the event, thus
+    they have to return immediately and hand the event over to their own
+    thread or event loop.
+    '''
+
+    def __init__(self):
+        '''
+        Constructor.
+        '''
+        self.lock        = Lock()
+        self.subscribers = ()
+
+    def subscribe(self, callback):
+        '''
+        Subscribe to all events.
+
+        :param callable callback: The callback, which is called with the event
+        '''
+        with self.lock:
+            self.subscribers += (callback,)
+
+    def unsubscribe(self, callback):
+        '''
+        Unsubscribe from all events.
+
+        :param callable callback: The callback
+        '''
+        with self.lock:
+            self.subscribers = tuple(sub for sub in self.subscribers if sub != callback)
+
+    def publish(self, event_type, data):
+        '''
+        Publish an event to all subscribers.
+
+        :param str event_type: The type of the event
+        :param dict data: The event data
+        '''
+        event = {
+            'type': event_type,
+            'data': data,
+        }
+
+        for callback in self.subscribers:
+            try:
+                callback(event)
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception('Delivering %s event to %r failed', event_type, callback)
+
+
+EVENTS = EventBus()
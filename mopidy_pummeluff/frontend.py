@@ -8,11 +8,23 @@ __all__ = (
 
 from logging import getLogger
 from threading import Event
+from time import monotonic
 
 import pykka
 from mopidy import core as mopidy_core
 
-from .threads import GPIOHandler, TagReader
+from .debounce import DEBOUNCER
+from .gpio import create_gpio
+from .history import HISTORY
+from .mixer import VOLUME
+from .playlists import PLAYLISTS
+from .readers import create_reader
+from .registry import REGISTRY
+from .resume import LOADED, RESUME
+from .sound import start_player, stop_player
+from .status import STATUS
+from .targets import TARGETS
+from .threads import ActionDispatcher, GPIOHandler, TagReader, TargetWarmer, TracklistLoader
 
 LOGGER = getLogger(__name__)
 
@@ -25,22 +37,262 @@ class PummeluffFrontend(pykka.ThreadingActor, mopidy_core.CoreListener):
 
     def __init__(self, config, core):
         super().__init__()
-        self.config       = config
-        self.core         = core
-        self.stop_event   = Event()
-        self.gpio_handler = GPIOHandler(core=core, config=config, stop_event=self.stop_event)
-        self.tag_reader   = TagReader(core=core, stop_event=self.stop_event)
+        started            = monotonic()
+        self.config        = config
+        self.core          = core
+        self.startup       = {}
+        self.stop_event    = Event()
+        self.dispatcher    = ActionDispatcher(
+            core=core,
+            stop_event=self.stop_event,
+            queue_size=config['pummeluff']['dispatch_queue_size'],
+        )
+        self.gpio_handler  = GPIOHandler(
+            core=core,
+            config=config,
+            dispatcher=self.dispatcher,
+            stop_event=self.stop_event,
+            gpio=self.create_gpio(config['pummeluff']),
+            hold_interval=0.05 if config['pummeluff']['button_repeat'] else None,
+        )
+        self.tag_reader    = TagReader(
+            core=core,
+            dispatcher=self.dispatcher,
+            stop_event=self.stop_event,
+            reader=self.create_reader(config['pummeluff']),
+            backoff=config['pummeluff']['reader_backoff'] / 1000,
+        )
+        self.target_warmer = TargetWarmer(
+            core=core,
+            stop_event=self.stop_event,
+            batch_size=config['pummeluff']['warmup_batch_size'],
+        )
+
+        DEBOUNCER.configure(
+            'tag',
+            window=config['pummeluff']['tag_debounce'] / 1000,
+            repeat=config['pummeluff']['tag_repeat'] / 1000,
+        )
+        DEBOUNCER.configure(
+            'button',
+            window=config['pummeluff']['button_debounce'] / 1000,
+            repeat=config['pummeluff']['button_repeat'] / 1000,
+        )
+
+        HISTORY.resize(config['pummeluff']['history_size'])
+        PLAYLISTS.cache_items = config['pummeluff']['cache_playlist_items']
+        TARGETS.enabled       = config['pummeluff']['warmup']
+        TARGETS.ttl           = config['pummeluff']['warmup_ttl']
+        RESUME.enabled        = config['pummeluff']['resume']
+        RESUME.flush_interval = config['pummeluff']['resume_flush_interval']
+        LOADED.policy         = config['pummeluff']['rescan_policy']
+
+        TracklistLoader.enabled    = config['pummeluff']['progressive_load']
+        TracklistLoader.head       = config['pummeluff']['progressive_head']
+        TracklistLoader.batch_size = config['pummeluff']['progressive_batch']
+
+        self.startup['init'] = monotonic() - started
+
+    @staticmethod
+    def create_gpio(config):
+        '''
+        Create the GPIO backend according to the config.
+
+        :param dict config: The Pummeluff config
+
+        :return: The GPIO backend
+        :rtype: mopidy_pummeluff.gpio.GPIOBackend
+        '''
+        backend = config['gpio']
+
+        if backend == 'gpiod':
+            return create_gpio(backend, chip=config['gpio_chip'] or 'gpiochip0')
+
+        return create_gpio(backend)
+
+    @staticmethod
+    def create_reader(config):
+        '''
+        Create the reader backend according to the config.
+
+        :param dict config: The Pummeluff config
+
+        :return: The reader backend
+        :rtype: mopidy_pummeluff.readers.Reader
+        '''
+        reader = config['reader']
+
+        if reader == 'hid':
+            return create_reader(reader, device=config['reader_device'])
+
+        if reader == 'simulated':
+            return create_reader(
+                reader,
+                uids=config['simulated_uids'],
+                rate=config['simulated_rate'],
+            )
+
+        return create_reader(
+            reader,
+            mode=config['reader_mode'],
+            poll_interval=config['reader_poll_interval'] / 1000,
+            retries=config['reader_retries'],
+            spi_speed=config['reader_spi_speed'],
+        )
 
     def on_start(self):
         '''
-        Start GPIO handler & tag reader threads.
+        Open the registry, and start sound player, action dispatcher, GPIO
+        handler, tag reader and (if enabled) target warmer threads.
+
+        The durations of the startup phases are logged and exposed as
+        ``startup`` status.
         '''
+        started = monotonic()
+        REGISTRY.open(self.config['pummeluff']['registry_path'])
+        self.startup['registry'] = monotonic() - started
+
+        start_player(self.config['pummeluff']['sound_backend'])
+        STATUS.register('startup', self.startup.copy)
+        STATUS.register('dispatcher', self.dispatcher.as_dict)
+        STATUS.register('warmup', TARGETS.as_dict)
+        STATUS.register('reader', self.tag_reader.as_dict)
+        STATUS.register('debounce', DEBOUNCER.as_dict)
+        STATUS.register('gpio', self.gpio_handler.as_dict)
+        STATUS.register('volume', VOLUME.as_dict)
+        STATUS.register('resume', RESUME.as_dict)
+        STATUS.register('tracklist', LOADED.as_dict)
+        STATUS.register('loader', TracklistLoader.status)
+
+        RESUME.resume_path = self.config['pummeluff']['resume_path']
+
+        if RESUME.enabled:
+            RESUME.load()
+
+        self.dispatcher.start()
         self.gpio_handler.start()
         self.tag_reader.start()
 
+        if TARGETS.enabled:
+            self.target_warmer.start()
+
+        self.startup['start'] = monotonic() - started
+
+        LOGGER.info(
+            'Pummeluff started in %.1fms (init %.1fms, registry %.1fms with %d tags)',
+            (self.startup['init'] + self.startup['start']) * 1000,
+            self.startup['init'] * 1000,
+            self.startup['registry'] * 1000,
+            len(REGISTRY) + len(REGISTRY.legacy),
+        )
+
     def on_stop(self):
         '''
         Set threading stop event to tell GPIO handler & tag reader threads to
         stop their operations.
         '''
         self.stop_event.set()
+        self.dispatcher.stop()
+        STATUS.unregister('startup')
+        STATUS.unregister('dispatcher')
+        STATUS.unregister('warmup')
+        STATUS.unregister('reader')
+        STATUS.unregister('debounce')
+        STATUS.unregister('gpio')
+        STATUS.unregister('volume')
+        STATUS.unregister('resume')
+        STATUS.unregister('tracklist')
+        STATUS.unregister('loader')
+        TracklistLoader.cancel_current()
+        RESUME.flush()
+        stop_player()
+
+    def playlists_loaded(self):
+        '''
+        Reload the playlist index when the playlists are (re)loaded.
+        '''
+        PLAYLISTS.load(self.core)
+
+    def playlist_changed(self, playlist):
+        '''
+        Update a playlist in the playlist index when it has changed.
+
+        :param mopidy.models.Playlist playlist: The changed playlist
+        '''
+        PLAYLISTS.update(playlist)
+        TARGETS.invalidate(playlist.uri)
+
+    def playlist_deleted(self, uri):
+        '''
+        Remove a playlist from the playlist index when it was deleted.
+
+        :param str uri: The URI of the deleted playlist
+        '''
+        PLAYLISTS.remove(uri)
+        TARGETS.invalidate(uri)
+
+    def volume_changed(self, volume):
+        '''
+        Track the mixer volume when it has changed.
+
+        :param int volume: The new volume
+        '''
+        VOLUME.update(volume)
+
+    def track_playback_started(self, tl_track):
+        '''
+        Record the playback position when the playback of a track has
+        started, so that the actually played next track is recorded (e.g. in
+        random mode).
+
+        :param mopidy.models.TlTrack tl_track: The started track
+        '''
+        self.record_position(tl_track, 0)
+
+    def track_playback_paused(self, tl_track, time_position):
+        '''
+        Record the playback position when the playback was paused.
+
+        :param mopidy.models.TlTrack tl_track: The paused track
+        :param int time_position: The time position in ms
+        '''
+        self.record_position(tl_track, time_position)
+
+    def track_playback_ended(self, tl_track, time_position):
+        '''
+        Record the playback position when the playback of a track has ended
+        (e.g. when it was stopped or skipped).
+
+        :param mopidy.models.TlTrack tl_track: The ended track
+        :param int time_position: The time position in ms
+        '''
+        self.record_position(tl_track, time_position, ended=True)
+
+    def record_position(self, tl_track, time_position, ended=False):
+        '''
+        Record the playback position of a track, which was loaded by a tag.
+
+        When a track has ended at its end, the position of the next track is
+        recorded instead. In random mode, the next track isn't known yet, thus
+        it's recorded when it's started.
+
+        :param mopidy.models.TlTrack tl_track: The track
+        :param int time_position: The time position in ms
+        :param bool ended: The playback of the track has ended
+        '''
+        loaded = LOADED.lookup(tl_track.tlid)
+
+        if loaded is None:
+            return
+
+        uri, index, offset = loaded
+        length             = tl_track.track.length
+
+        if ended and length and time_position >= length - 1000:
+            if self.core.tracklist.get_random().get():
+                return
+
+            # The next track is found on playback (see Tracklist.find_tlid).
+            offset, time_position = offset + 1, 0
+
+        RESUME.set(uri, index, time_position, offset)
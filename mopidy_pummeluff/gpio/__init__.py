@@ -0,0 +1,39 @@
+'''
+Python module for Mopidy Pummeluff GPIO backends.
+
+The GPIO backends are imported lazily, so that their hardware specific
+dependencies are only required when they're used.
+'''
+
+__all__ = (
+    'EDGES',
+    'PinEvent',
+    'GPIOBackend',
+    'GPIO_BACKENDS',
+    'create_gpio',
+)
+
+from importlib import import_module
+
+from .base import EDGES, GPIOBackend, PinEvent
+
+GPIO_BACKENDS = {
+    'rpi': ('rpi', 'RPiGPIOBackend'),
+    'gpiod': ('chardev', 'GpiodBackend'),
+    'fake': ('fake', 'FakeGPIOBackend'),
+}
+
+
+def create_gpio(name, **kwargs):
+    '''
+    Create a GPIO backend by its name.
+
+    :param str name: The name of the GPIO backend
+    :param dict \\**kwargs: The keyword arguments for the GPIO backend
+
+    :return: The GPIO backend
+    :rtype: GPIOBackend
+    '''
+    module, class_name = GPIO_BACKENDS[name]
+    backend_class      = getattr(import_module(f'.{module}', __name__), class_name)
+    return backend_class(**kwargs)
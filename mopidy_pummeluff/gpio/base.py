@@ -0,0 +1,155 @@
+'''
+Python module for the Mopidy Pummeluff base GPIO backend.
+'''
+
+__all__ = (
+    'EDGES',
+    'PinEvent',
+    'GPIOBackend',
+)
+
+from collections import namedtuple
+from queue import Empty, Queue
+from time import monotonic
+
+#: The supported edges of input pins.
+EDGES = ('falling', 'rising', 'both')
+
+#: An event of an input pin, where ``pressed`` is ``True`` when the pin is
+#: pulled low (i.e. the button is pushed).
+PinEvent = namedtuple('PinEvent', ('pin', 'pressed', 'timestamp'))
+
+
+class GPIOBackend:
+    '''
+    Base GPIO backend class, which has to be implemented by all GPIO
+    backends.
+
+    Pins are addressed by their physical (``BOARD``) number. Input pins are
+    pulled up, thus a pushed button pulls them low.
+
+    Backends don't call any callbacks, instead they put the events of all
+    input pins in a single queue via :py:meth:`emit`, which is drained by the
+    GPIO handler thread via :py:meth:`wait_event`. This way, events are
+    handled one after another in the order they happened.
+    '''
+
+    #: The backend debounces its pins natively.
+    native_bouncetime = False
+
+    def __init__(self):
+        '''
+        Constructor.
+        '''
+        self.queue       = Queue()
+        self.bouncetimes = {}
+        self.last_events = {}
+        self.counters    = {'events': 0, 'bounced': 0}
+
+    def setup_input(self, pin, edge='falling', bouncetime=0):
+        '''
+        Set up an input pin with pull-up and event detection.
+
+        :param int pin: The pin number
+        :param str edge: The detected edge (``falling``, ``rising`` or ``both``)
+        :param float bouncetime: The bounce time in seconds
+
+        :raises NotImplementedError: When method is not implemented
+        '''
+        raise NotImplementedError(f'Missing setup_input method in the {self.__class__.__name__} class')
+
+    def setup_output(self, pin, value=False):
+        '''
+        Set up an output pin.
+
+        :param int pin: The pin number
+        :param bool value: The initial value
+
+        :raises NotImplementedError: When method is not implemented
+        '''
+        raise NotImplementedError(f'Missing setup_output method in the {self.__class__.__name__} class')
+
+    def output(self, pin, value):
+        '''
+        Set the value of an output pin.
+
+        :param int pin: The pin number
+        :param bool value: The value
+
+        :raises NotImplementedError: When method is not implemented
+        '''
+        raise NotImplementedError(f'Missing output method in the {self.__class__.__name__} class')
+
+    def is_pressed(self, pin):
+        '''
+        Check if an input pin is pulled low.
+
+        :param int pin: The pin number
+
+        :return: Pin is pulled low
+        :rtype: bool
+
+        :raises NotImplementedError: When method is not implemented
+        '''
+        raise NotImplementedError(f'Missing is_pressed method in the {self.__class__.__name__} class')
+
+    def cleanup(self):
+        '''
+        Release all pins.
+        '''
+
+    def emit(self, pin, pressed, timestamp=None):
+        '''
+        Put an event of an input pin into the event queue.
+
+        Events within the bounce time of the previous event of the same pin
+        are dropped, unless the backend debounces its pins natively.
+
+        This can be called from any thread.
+
+        :param int pin: The pin number
+        :param bool pressed: The pin is pulled low
+        :param float timestamp: The monotonic timestamp of the event
+        '''
+        if timestamp is None:
+            timestamp = monotonic()
+
+        if not self.native_bouncetime:
+            bouncetime = self.bouncetimes.get(pin, 0)
+            previous   = self.last_events.get(pin)
+
+            if bouncetime and previous is not None and timestamp - previous < bouncetime:
+                self.counters['bounced'] += 1
+                return
+
+            self.last_events[pin] = timestamp
+
+        self.counters['events'] += 1
+        self.queue.put(PinEvent(pin, pressed, timestamp))
+
+    def wait_event(self, timeout=None):
+        '''
+        Wait for the next event of an input pin.
+
+        :param float timeout: The timeout in seconds
+
+        :return: The event or ``None`` on timeout
+        :rtype: PinEvent
+        '''
+        try:
+            return self.queue.get(timeout=timeout)
+        except Empty:
+            return None
+
+    def as_dict(self):
+        '''
+        Dict representation of the backend status.
+
+        :return: The dict version of the status
+        :rtype: dict
+        '''
+        return {
+            'backend': self.__class__.__name__,
+            'queued': self.queue.qsize(),
+            **self.counters,
+        }
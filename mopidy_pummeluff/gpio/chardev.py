@@ -0,0 +1,164 @@
+'''
+Python module for the Mopidy Pummeluff libgpiod backend.
+'''
+
+__all__ = (
+    'BOARD_TO_BCM',
+    'GpiodBackend',
+)
+
+from threading import Event, Lock, Thread
+
+from .base import GPIOBackend
+
+#: The mapping of the physical pin numbers of the 40-pin header to the BCM
+#: GPIO numbers, which are the line offsets of the GPIO chip.
+BOARD_TO_BCM = {
+    3: 2, 5: 3, 7: 4, 8: 14, 10: 15, 11: 17, 12: 18, 13: 27, 15: 22, 16: 23,
+    18: 24, 19: 10, 21: 9, 22: 25, 23: 11, 24: 8, 26: 7, 27: 0, 28: 1, 29: 5,
+    31: 6, 32: 12, 33: 13, 35: 19, 36: 16, 37: 26, 38: 20, 40: 21,
+}
+
+
+class GpiodBackend(GPIOBackend):
+    '''
+    GPIO backend for the GPIO character device (``/dev/gpiochip*``) via the
+    optional ``gpiod`` module (Python bindings of ``libgpiod`` v1), which
+    works on all recent kernels.
+
+    The kernel queues the edge events of all requested lines, which are read
+    by a dedicated thread and put into the event queue. Inputs can be set up
+    while the thread is running, thus it reads a snapshot of the inputs.
+    '''
+
+    def __init__(self, chip='gpiochip0', consumer='pummeluff'):
+        '''
+        Constructor.
+
+        :param str chip: The name or path of the GPIO chip (e.g. ``gpiochip4``
+            on a Raspberry Pi 5)
+        :param str consumer: The consumer name of the requested lines
+
+        :raises ImportError: When ``gpiod`` is not installed
+        '''
+        import gpiod  # pylint: disable=import-error,import-outside-toplevel
+
+        super().__init__()
+        self.gpiod      = gpiod
+        self.chip       = gpiod.Chip(chip)
+        self.consumer   = consumer
+        self.lock       = Lock()
+        self.inputs     = {}
+        self.outputs    = {}
+        self.stop_event = Event()
+        self.thread     = Thread(target=self.read_events, name='PummeluffGpiodEvents', daemon=True)
+        self.edges      = {
+            'falling': gpiod.LINE_REQ_EV_FALLING_EDGE,
+            'rising': gpiod.LINE_REQ_EV_RISING_EDGE,
+            'both': gpiod.LINE_REQ_EV_BOTH_EDGES,
+        }
+
+    def get_line(self, pin):
+        '''
+        Return the line of a pin.
+
+        :param int pin: The physical pin number
+
+        :return: The line
+        :rtype: gpiod.Line
+
+        :raises ValueError: When the pin isn't a GPIO pin
+        '''
+        try:
+            return self.chip.get_line(BOARD_TO_BCM[pin])
+        except KeyError as ex:
+            raise ValueError(f'Pin {pin} is not a GPIO pin') from ex
+
+    def setup_input(self, pin, edge='falling', bouncetime=0):
+        '''
+        Set up an input pin with pull-up and event detection.
+
+        :param int pin: The pin number
+        :param str edge: The detected edge (``falling``, ``rising`` or ``both``)
+        :param float bouncetime: The bounce time in seconds
+        '''
+        line = self.get_line(pin)
+        line.request(
+            consumer=self.consumer,
+            type=self.edges[edge],
+            flags=self.gpiod.LINE_REQ_FLAG_BIAS_PULL_UP,
+        )
+
+        with self.lock:
+            self.inputs[pin]      = line
+            self.bouncetimes[pin] = bouncetime
+
+            if self.thread.ident is None:
+                self.thread.start()
+
+    def read_events(self):
+        '''
+        Read the edge events of all input lines until the backend is cleaned
+        up.
+        '''
+        falling = self.gpiod.LineEvent.FALLING_EDGE
+
+        while not self.stop_event.is_set():
+            with self.lock:
+                inputs = list(self.inputs.items())
+
+            pins  = {line.offset(): pin for pin, line in inputs}
+            ready = self.gpiod.LineBulk([line for _, line in inputs]).event_wait(nsec=200000000)
+
+            for line in ready or ():
+                event = line.event_read()
+                self.emit(pins[line.offset()], event.type == falling)
+
+    def setup_output(self, pin, value=False):
+        '''
+        Set up an output pin.
+
+        :param int pin: The pin number
+        :param bool value: The initial value
+        '''
+        line = self.get_line(pin)
+        line.request(
+            consumer=self.consumer,
+            type=self.gpiod.LINE_REQ_DIR_OUT,
+            default_vals=[int(value)],
+        )
+        self.outputs[pin] = line
+
+    def output(self, pin, value):
+        '''
+        Set the value of an output pin.
+
+        :param int pin: The pin number
+        :param bool value: The value
+        '''
+        self.outputs[pin].set_value(int(value))
+
+    def is_pressed(self, pin):
+        '''
+        Check if an input pin is pulled low.
+
+        :param int pin: The pin number
+
+        :return: Pin is pulled low
+        :rtype: bool
+        '''
+        return not self.inputs[pin].get_value()
+
+    def cleanup(self):
+        '''
+        Stop reading events and release all lines.
+        '''
+        self.stop_event.set()
+
+        if self.thread.is_alive():
+            self.thread.join()
+
+        for line in (*self.inputs.values(), *self.outputs.values()):
+            line.release()
+
+        self.chip.close()
@@ -0,0 +1,91 @@
+'''
+Python module for the Mopidy Pummeluff fake GPIO backend.
+'''
+
+__all__ = (
+    'FakeGPIOBackend',
+)
+
+from .base import GPIOBackend
+
+
+class FakeGPIOBackend(GPIOBackend):
+    '''
+    GPIO backend without any hardware, where buttons are pushed and released
+    via :py:meth:`press` & :py:meth:`release`.
+
+    It can be used to test and benchmark the GPIO handler on any machine.
+    '''
+
+    def __init__(self):
+        '''
+        Constructor.
+        '''
+        super().__init__()
+        self.edges   = {}
+        self.pressed = set()
+        self.outputs = {}
+
+    def setup_input(self, pin, edge='falling', bouncetime=0):
+        '''
+        Set up an input pin with pull-up and event detection.
+
+        :param int pin: The pin number
+        :param str edge: The detected edge (``falling``, ``rising`` or ``both``)
+        :param float bouncetime: The bounce time in seconds
+        '''
+        self.edges[pin]       = edge
+        self.bouncetimes[pin] = bouncetime
+
+    def setup_output(self, pin, value=False):
+        '''
+        Set up an output pin.
+
+        :param int pin: The pin number
+        :param bool value: The initial value
+        '''
+        self.outputs[pin] = value
+
+    def output(self, pin, value):
+        '''
+        Set the value of an output pin.
+
+        :param int pin: The pin number
+        :param bool value: The value
+        '''
+        self.outputs[pin] = value
+
+    def is_pressed(self, pin):
+        '''
+        Check if an input pin is pulled low.
+
+        :param int pin: The pin number
+
+        :return: Pin is pulled low
+        :rtype: bool
+        '''
+        return pin in self.pressed
+
+    def press(self, pin, timestamp=None):
+        '''
+        Push the button of a pin, which emits an event on a falling edge.
+
+        :param int pin: The pin number
+        :param float timestamp: The monotonic timestamp of the event
+        '''
+        self.pressed.add(pin)
+
+        if self.edges.get(pin) in ('falling', 'both'):
+            self.emit(pin, True, timestamp)
+
+    def release(self, pin, timestamp=None):
+        '''
+        Release the button of a pin, which emits an event on a rising edge.
+
+        :param int pin: The pin number
+        :param float timestamp: The monotonic timestamp of the event
+        '''
+        self.pressed.discard(pin)
+
+        if self.edges.get(pin) in ('rising', 'both'):
+            self.emit(pin, False, timestamp)
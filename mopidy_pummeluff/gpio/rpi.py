@@ -0,0 +1,98 @@
+'''
+Python module for the Mopidy Pummeluff RPi.GPIO backend.
+'''
+
+__all__ = (
+    'RPiGPIOBackend',
+)
+
+from .base import GPIOBackend
+
+
+class RPiGPIOBackend(GPIOBackend):
+    '''
+    GPIO backend for the ``RPi.GPIO`` module, which uses the deprecated
+    ``sysfs`` interface and thus only works on older kernels.
+
+    ``RPi.GPIO`` calls the event callbacks on its own thread, which only puts
+    the events into the event queue.
+    '''
+
+    native_bouncetime = True
+
+    def __init__(self):
+        '''
+        Constructor.
+        '''
+        from RPi import GPIO  # pylint: disable=import-error,import-outside-toplevel
+
+        super().__init__()
+        self.gpio  = GPIO
+        self.edges = {
+            'falling': GPIO.FALLING,
+            'rising': GPIO.RISING,
+            'both': GPIO.BOTH,
+        }
+
+        GPIO.setmode(GPIO.BOARD)
+
+    def setup_input(self, pin, edge='falling', bouncetime=0):
+        '''
+        Set up an input pin with pull-up and event detection.
+
+        :param int pin: The pin number
+        :param str edge: The detected edge (``falling``, ``rising`` or ``both``)
+        :param float bouncetime: The bounce time in seconds
+        '''
+        gpio   = self.gpio
+        kwargs = {'bouncetime': int(bouncetime * 1000)} if bouncetime else {}
+
+        gpio.setup(pin, gpio.IN, pull_up_down=gpio.PUD_UP)
+        gpio.add_event_detect(pin, self.edges[edge], callback=self.callback, **kwargs)
+
+    def callback(self, pin):
+        '''
+        Callback of ``RPi.GPIO`` when an edge was detected.
+
+        :param int pin: The pin number
+        '''
+        self.emit(pin, self.is_pressed(pin))
+
+    def setup_output(self, pin, value=False):
+        '''
+        Set up an output pin.
+
+        :param int pin: The pin number
+        :param bool value: The initial value
+        '''
+        gpio = self.gpio
+        gpio.setup(pin, gpio.OUT)
+        self.output(pin, value)
+
+    def output(self, pin, value):
+        '''
+        Set the value of an output pin.
+
+        :param int pin: The pin number
+        :param bool value: The value
+        '''
+        gpio = self.gpio
+        gpio.output(pin, gpio.HIGH if value else gpio.LOW)
+
+    def is_pressed(self, pin):
+        '''
+        Check if an input pin is pulled low.
+
+        :param int pin: The pin number
+
+        :return: Pin is pulled low
+        :rtype: bool
+        '''
+        gpio = self.gpio
+        return gpio.input(pin) == gpio.LOW
+
+    def cleanup(self):
+        '''
+        Release all pins.
+        '''
+        self.gpio.cleanup()
@@ -0,0 +1,146 @@
+'''
+Python module for Mopidy Pummeluff scan history.
+'''
+
+__all__ = (
+    'ScanEvent',
+    'ScanHistory',
+    'HISTORY',
+)
+
+from threading import Lock
+
+
+class ScanEvent:  # pylint: disable=too-few-public-methods
+    '''
+    A single scan event in the scan history.
+    '''
+
+    __slots__ = ('uid', 'action', 'scanned', 'latency', 'outcome')
+
+    def __init__(self, uid, action, scanned, latency, outcome):  # pylint: disable=too-many-arguments
+        '''
+        Constructor.
+
+        :param str uid: The UID
+        :param str action: The name of the matched action
+        :param float scanned: The scanned timestamp
+        :param float latency: The read latency in seconds
+        :param str outcome: The outcome (e.g. ``dispatched`` or ``unregistered``)
+        '''
+        self.uid     = uid
+        self.action  = action
+        self.scanned = scanned
+        self.latency = latency
+        self.outcome = outcome
+
+    def __repr__(self):
+        '''
+        Instance representation of the scan event.
+
+        :return: The class name, UID and outcome
+        :rtype: str
+        '''
+        return f'<{self.__class__.__name__} {self.uid} {self.outcome}>'
+
+    def as_dict(self):
+        '''
+        Dict representation of the scan event.
+
+        :return: The dict version of the scan event
+        :rtype: dict
+        '''
+        return {
+            'uid': self.uid,
+            'action': self.action,
+            'scanned': self.scanned,
+            'latency': self.latency,
+            'outcome': self.outcome,
+        }
+
+
+class ScanHistory:
+    '''
+    Fixed-size ring buffer of the recent scan events.
+
+    The memory usage is bounded by its size, regardless of the uptime. When
+    the buffer is full, the oldest event is overwritten.
+    '''
+
+    def __init__(self, size=1000):
+        '''
+        Constructor.
+
+        :param int size: The maximum number of events
+        '''
+        self.lock = Lock()
+        self.resize(size)
+
+    def __len__(self):
+        '''
+        Return the number of events in the history.
+
+        :return: The number of events
+        :rtype: int
+        '''
+        return min(self.total, self.size)
+
+    def resize(self, size):
+        '''
+        Resize the history, which also clears it.
+
+        :param int size: The maximum number of events
+        '''
+        with self.lock:
+            self.size   = size
+            self.events = [None] * size
+            self.index  = 0
+            self.total  = 0
+
+    def append(self, uid, action, scanned, latency=None, outcome='dispatched'):  # pylint: disable=too-many-arguments
+        '''
+        Append a scan event to the history.
+
+        :param str uid: The UID
+        :param str action: The name of the matched action
+        :param float scanned: The scanned timestamp
+        :param float latency: The read latency in seconds
+        :param str outcome: The outcome
+        '''
+        event = ScanEvent(uid, action, scanned, latency, outcome)
+
+        with self.lock:
+            self.events[self.index] = event
+            self.index              = (self.index + 1) % self.size
+            self.total             += 1
+
+    def query(self, since=None, until=None, limit=None):
+        '''
+        Return the scan events in chronological order.
+
+        :param float since: Only events scanned at or after this timestamp
+        :param float until: Only events scanned at or before this timestamp
+        :param int limit: Only the most recent number of matching events
+
+        :return: The scan events
+        :rtype: list[ScanEvent]
+        '''
+        with self.lock:
+            if self.total < self.size:
+                events = self.events[:self.index]
+            else:
+                events = self.events[self.index:] + self.events[:self.index]
+
+        if since is not None:
+            events = [event for event in events if event.scanned >= since]
+
+        if until is not None:
+            events = [event for event in events if event.scanned <= until]
+
+        if limit is not None:
+            events = events[-limit:] if limit else []
+
+        return events
+
+
+HISTORY = ScanHistory()
@@ -0,0 +1,82 @@
+'''
+Python module for Mopidy Pummeluff metrics.
+'''
+
+__all__ = (
+    'Histogram',
+)
+
+from bisect import bisect_left
+from threading import Lock
+
+
+class Histogram:
+    '''
+    Thread-safe histogram with fixed buckets, which can be used to measure
+    durations (in seconds) without keeping the individual measurements.
+    '''
+
+    buckets = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self, buckets=None):
+        '''
+        Constructor.
+
+        :param tuple buckets: The sorted upper bounds of the buckets (optional)
+        '''
+        if buckets is not None:
+            self.buckets = tuple(buckets)
+
+        self.lock = Lock()
+        self.reset()
+
+    def reset(self):
+        '''
+        Reset all measurements.
+        '''
+        with self.lock:
+            self.counts = [0] * (len(self.buckets) + 1)
+            self.count  = 0
+            self.sum    = 0.0
+            self.min    = None
+            self.max    = None
+
+    def observe(self, value):
+        '''
+        Add a measurement to the histogram.
+
+        :param float value: The measured value
+        '''
+        index = bisect_left(self.buckets, value)
+
+        with self.lock:
+            self.counts[index] += 1
+            self.count         += 1
+            self.sum           += value
+
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+
+    def as_dict(self):
+        '''
+        Dict representation of the histogram.
+
+        The buckets are represented as a mapping between the upper bound of
+        each bucket and the number of measurements in it.
+
+        :return: The dict version of the histogram
+        :rtype: dict
+        '''
+        with self.lock:
+            bounds = [str(bound) for bound in self.buckets] + ['inf']
+
+            return {
+                'count': self.count,
+                'sum': self.sum,
+                'min': self.min,
+                'max': self.max,
+                'mean': self.sum / self.count if self.count else None,
+                'buckets': dict(zip(bounds, self.counts)),
+            }
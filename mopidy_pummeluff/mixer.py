@@ -0,0 +1,154 @@
+'''
+Python module for Mopidy Pummeluff mixer volume tracking.
+'''
+
+__all__ = (
+    'VolumeTracker',
+    'VOLUME',
+)
+
+from logging import getLogger
+from threading import Lock, Timer
+
+from mopidy_pummeluff.events import EVENTS
+
+LOGGER = getLogger(__name__)
+
+
+class VolumeTracker:
+    '''
+    Tracker of the mixer volume, which is kept up to date by the
+    ``volume_changed`` event of Mopidy, so that relative volume changes
+    don't require a round trip to Mopidy core.
+
+    Volume changes are applied to the tracked volume immediately and
+    published as ``volume`` event, while a burst of volume changes is
+    coalesced into a single ``set_volume`` call after a short delay.
+    '''
+
+    def __init__(self, delay=0.05):
+        '''
+        Constructor.
+
+        :param float delay: The delay in seconds to coalesce volume changes
+        '''
+        self.lock      = Lock()
+        self.delay     = delay
+        self.volume    = None
+        self.target    = None
+        self.timer     = None
+        self.requested = 0
+        self.applied   = 0
+
+    def update(self, volume):
+        '''
+        Update the tracked volume from the mixer (e.g. on ``volume_changed``).
+
+        The volume is ignored while a change is pending, because the pending
+        change will override it anyway.
+
+        :param int volume: The mixer volume
+        '''
+        with self.lock:
+            if self.target is not None or volume == self.volume:
+                return
+            self.volume = volume
+
+        EVENTS.publish('volume', {'volume': volume})
+
+    def get(self, core):
+        '''
+        Return the current (or pending) volume.
+
+        The mixer is only asked when the volume isn't tracked yet.
+
+        :param mopidy.core.Core core: The mopidy core instance
+
+        :return: The volume
+        :rtype: int
+        '''
+        if self.volume is None:
+            volume = core.mixer.get_volume().get()
+            with self.lock:
+                if self.volume is None:
+                    self.volume = volume
+
+        with self.lock:
+            return self.target if self.target is not None else self.volume
+
+    def set(self, core, volume):
+        '''
+        Set the volume.
+
+        :param mopidy.core.Core core: The mopidy core instance
+        :param int volume: The new volume (which is clamped to 0 - 100)
+
+        :return: The new volume
+        :rtype: int
+        '''
+        volume = max(0, min(100, volume))
+
+        with self.lock:
+            self.target     = volume
+            self.requested += 1
+
+            if self.timer is None:
+                self.timer = Timer(self.delay, self.apply, args=(core,))
+                self.timer.daemon = True
+                self.timer.start()
+
+        EVENTS.publish('volume', {'volume': volume})
+
+        return volume
+
+    def step(self, core, step):
+        '''
+        Change the volume relatively.
+
+        :param mopidy.core.Core core: The mopidy core instance
+        :param int step: The step (negative to decrease)
+
+        :return: The new volume
+        :rtype: int
+        '''
+        volume = self.get(core)
+
+        if volume is None:
+            LOGGER.warning('Mixer volume is unknown, thus it can\'t be changed relatively')
+            return None
+
+        return self.set(core, volume + step)
+
+    def apply(self, core):
+        '''
+        Apply the pending volume to the mixer.
+
+        :param mopidy.core.Core core: The mopidy core instance
+        '''
+        with self.lock:
+            volume      = self.target
+            self.volume = volume
+            self.target = None
+            self.timer  = None
+
+            self.applied += 1
+
+        LOGGER.info('Setting volume to %s', volume)
+        core.mixer.set_volume(volume)
+
+    def as_dict(self):
+        '''
+        Dict representation of the volume status.
+
+        :return: The dict version of the status
+        :rtype: dict
+        '''
+        return {
+            'volume': self.volume,
+            'pending': self.target,
+            'requested': self.requested,
+            'applied': self.applied,
+        }
+
+
+VOLUME = VolumeTracker()
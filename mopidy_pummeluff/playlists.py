@@ -0,0 +1,151 @@
+'''
+Python module for Mopidy Pummeluff playlist index.
+'''
+
+__all__ = (
+    'PlaylistIndex',
+    'PLAYLISTS',
+)
+
+from logging import getLogger
+from threading import Lock
+
+LOGGER = getLogger(__name__)
+
+
+class PlaylistIndex:
+    '''
+    Class which caches the URIs of all playlists (and optionally the URIs of
+    their items), so that they don't have to be retreived from the Mopidy
+    core on every scan.
+
+    The index is loaded lazily and kept up to date via the playlist events of
+    the Mopidy core listener.
+    '''
+
+    def __init__(self, cache_items=True):
+        '''
+        Constructor.
+
+        :param bool cache_items: Cache the item URIs of the playlists
+        '''
+        self.cache_items = cache_items
+        self.lock        = Lock()
+        self.uris        = None
+        self.items       = {}
+
+    def __len__(self):
+        '''
+        Return the number of indexed playlists.
+
+        :return: The number of playlists
+        :rtype: int
+        '''
+        return len(self.uris or ())
+
+    @property
+    def loaded(self):
+        '''
+        Check if the index is loaded.
+
+        :return: The index is loaded
+        :rtype: bool
+        '''
+        return self.uris is not None
+
+    def load(self, core):
+        '''
+        (Re)load the playlist URIs from the Mopidy core.
+
+        :param mopidy.core.Core core: The mopidy core instance
+
+        :return: The playlist URIs
+        :rtype: set
+        '''
+        uris = {playlist.uri for playlist in core.playlists.as_list().get()}
+
+        with self.lock:
+            self.uris  = uris
+            self.items = {}
+
+        LOGGER.debug('Loaded %d playlists into playlist index', len(uris))
+
+        return uris
+
+    def invalidate(self):
+        '''
+        Invalidate the whole index, so that it's reloaded on the next lookup.
+        '''
+        with self.lock:
+            self.uris  = None
+            self.items = {}
+
+    def update(self, playlist):
+        '''
+        Update a single playlist in the index.
+
+        :param mopidy.models.Playlist playlist: The playlist
+        '''
+        with self.lock:
+            if self.uris is None:
+                return
+
+            self.uris.add(playlist.uri)
+
+            if self.cache_items:
+                self.items[playlist.uri] = [track.uri for track in playlist.tracks]
+            else:
+                self.items.pop(playlist.uri, None)
+
+    def remove(self, uri):
+        '''
+        Remove a single playlist from the index.
+
+        :param str uri: The playlist URI
+        '''
+        with self.lock:
+            if self.uris is not None:
+                self.uris.discard(uri)
+            self.items.pop(uri, None)
+
+    def is_playlist(self, core, uri):
+        '''
+        Check if an URI is a playlist URI.
+
+        :param mopidy.core.Core core: The mopidy core instance
+        :param str uri: The URI
+
+        :return: URI is a playlist URI
+        :rtype: bool
+        '''
+        uris = self.uris
+
+        if uris is None:
+            uris = self.load(core)
+
+        return uri in uris
+
+    def get_items(self, core, uri):
+        '''
+        Return the URIs of the items of a playlist.
+
+        :param mopidy.core.Core core: The mopidy core instance
+        :param str uri: The playlist URI
+
+        :return: The item URIs
+        :rtype: list
+        '''
+        items = self.items.get(uri)
+
+        if items is None:
+            items = [item.uri for item in core.playlists.get_items(uri).get() or ()]
+
+            if self.cache_items:
+                with self.lock:
+                    if self.uris is not None and uri in self.uris:
+                        self.items[uri] = items
+
+        return items
+
+
+PLAYLISTS = PlaylistIndex()
@@ -0,0 +1,38 @@
+'''
+Python module for Mopidy Pummeluff readers.
+
+The reader backends are imported lazily, so that their hardware specific
+dependencies are only required when they're used.
+'''
+
+__all__ = (
+    'ReadError',
+    'Reader',
+    'READERS',
+    'create_reader',
+)
+
+from importlib import import_module
+
+from .base import Reader, ReadError
+
+READERS = {
+    'mfrc522': ('mfrc522', 'MFRC522Reader'),
+    'hid': ('hid', 'HIDReader'),
+    'simulated': ('simulated', 'SimulatedReader'),
+}
+
+
+def create_reader(name, **kwargs):
+    '''
+    Create a reader backend by its name.
+
+    :param str name: The name of the reader backend
+    :param dict \\**kwargs: The keyword arguments for the reader backend
+
+    :return: The reader backend
+    :rtype: Reader
+    '''
+    module, class_name = READERS[name]
+    reader_class       = getattr(import_module(f'.{module}', __name__), class_name)
+    return reader_class(**kwargs)
@@ -0,0 +1,95 @@
+'''
+Python module for the Mopidy Pummeluff base reader.
+'''
+
+__all__ = (
+    'ReadError',
+    'Reader',
+)
+
+from time import monotonic
+
+from mopidy_pummeluff.metrics import Histogram
+
+
+class ReadError(Exception):
+    '''
+    Exception which is thrown when an RFID read error occurs.
+    '''
+
+
+class Reader:
+    '''
+    Base reader class, which has to be implemented by all reader backends.
+
+    A reader backend detects tags via :py:meth:`wait_for_tag` and returns
+    their UID via :py:meth:`read_uid`. Durations of the individual read stages
+    can be measured via :py:meth:`timed`.
+    '''
+
+    stages = ('wait',)
+
+    def __init__(self):
+        '''
+        Constructor.
+        '''
+        self.timings = {stage: Histogram() for stage in self.stages}
+
+    def wait_for_tag(self, stop_event):
+        '''
+        Wait until a tag is touched.
+
+        Implementations should return from time to time (i.e. ``False``), so
+        that the stop event can be checked.
+
+        :param threading.Event stop_event: The stop event
+
+        :return: A tag is present
+        :rtype: bool
+
+        :raises NotImplementedError: When method is not implemented
+        '''
+        raise NotImplementedError(f'Missing wait_for_tag method in the {self.__class__.__name__} class')
+
+    def read_uid(self):
+        '''
+        Return the UID from the tag.
+
+        :return: The UID bytes
+        :rtype: bytes
+
+        :raises ReadError: When RFID tag couldn't be read
+        :raises NotImplementedError: When method is not implemented
+        '''
+        raise NotImplementedError(f'Missing read_uid method in the {self.__class__.__name__} class')
+
+    def close(self):
+        '''
+        Release all resources of the reader.
+        '''
+
+    def timed(self, stage, function, *args):
+        '''
+        Call a function and measure its duration.
+
+        :param str stage: The name of the stage
+        :param callable function: The function
+        :param list \\*args: The positional arguments for the function
+
+        :return: The result of the function
+        '''
+        started = monotonic()
+        result  = function(*args)
+        self.timings[stage].observe(monotonic() - started)
+        return result
+
+    def as_dict(self):
+        '''
+        Dict representation of the reader status.
+
+        :return: The dict version of the status
+        :rtype: dict
+        '''
+        return {
+            'reader': self.__class__.__name__,
+        }
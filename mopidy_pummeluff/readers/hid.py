@@ -0,0 +1,120 @@
+'''
+Python module for the Mopidy Pummeluff HID reader.
+'''
+
+__all__ = (
+    'HIDReader',
+)
+
+from collections import deque
+from select import select
+
+from mopidy_pummeluff.uid import parse_uid
+
+from .base import Reader, ReadError
+
+
+class HIDReader(Reader):
+    '''
+    Reader backend for USB RFID readers which act as keyboard (aka keyboard
+    wedge), via the optional ``evdev`` module.
+
+    The reader "types" the UID followed by the enter key. The input device is
+    grabbed, so that the key presses don't end up anywhere else.
+    '''
+
+    stages = ('wait',)
+
+    keys = {f'KEY_{char}': char for char in '0123456789ABCDEF'}
+
+    def __init__(self, device, timeout=0.5):
+        '''
+        Constructor.
+
+        :param str device: The path of the input device (e.g. ``/dev/input/event0``)
+        :param float timeout: The timeout in seconds while waiting for input
+
+        :raises ImportError: When ``evdev`` is not installed
+        '''
+        # pylint: disable=import-error,import-outside-toplevel
+        from evdev import InputDevice, ecodes
+
+        super().__init__()
+        self.ecodes  = ecodes
+        self.device  = InputDevice(device)
+        self.timeout = timeout
+        self.buffer  = []
+        self.uids    = deque()
+
+        self.device.grab()
+
+    def wait_for_tag(self, stop_event):
+        '''
+        Wait until a complete UID was typed or the timeout is reached.
+
+        :param threading.Event stop_event: The stop event
+
+        :return: A tag is present
+        :rtype: bool
+        '''
+        ecodes = self.ecodes
+
+        while not self.uids and not stop_event.is_set():
+            readable, _, _ = select([self.device.fd], [], [], self.timeout)
+            if not readable:
+                return False
+
+            for event in self.device.read():
+                if event.type != ecodes.EV_KEY or event.value != 1:
+                    continue
+
+                name = ecodes.KEY.get(event.code)
+
+                if name == 'KEY_ENTER':
+                    if self.buffer:
+                        self.uids.append(''.join(self.buffer))
+                        self.buffer.clear()
+                elif name in self.keys:
+                    self.buffer.append(self.keys[name])
+
+        return bool(self.uids)
+
+    def read_uid(self):
+        '''
+        Return the UID which was typed by the reader.
+
+        Typed UIDs with an odd number of digits are zero-padded.
+
+        :return: The UID bytes
+        :rtype: bytes
+
+        :raises ReadError: When no or an invalid UID was typed
+        '''
+        try:
+            uid = self.uids.popleft()
+        except IndexError as ex:
+            raise ReadError('No UID typed') from ex
+
+        try:
+            return parse_uid(uid.zfill(len(uid) + len(uid) % 2))
+        except ValueError as ex:
+            raise ReadError(str(ex)) from ex
+
+    def close(self):
+        '''
+        Release and close the input device.
+        '''
+        self.device.ungrab()
+        self.device.close()
+
+    def as_dict(self):
+        '''
+        Dict representation of the reader status.
+
+        :return: The dict version of the status
+        :rtype: dict
+        '''
+        return {
+            **super().as_dict(),
+            'device': self.device.path,
+        }
@@ -0,0 +1,165 @@
+'''
+Python module for the Mopidy Pummeluff MFRC522 reader.
+'''
+
+__all__ = (
+    'MFRC522Reader',
+)
+
+from mopidy_pummeluff.uid import CASCADE_TAG
+
+from .base import Reader, ReadError
+
+#: The anticollision / select commands of the three cascade levels.
+CASCADE_LEVELS = (0x93, 0x95, 0x97)
+
+
+class MFRC522Reader(Reader):
+    '''
+    Reader backend for the ``RC522`` RFID module connected via SPI.
+
+    The reader supports two modes:
+
+    - ``irq``: Wait for the IRQ (interrupt) of the RFID reader. This is
+      blocking as long as no tag is touched, even when Mopidy is exiting.
+    - ``poll``: Poll the RFID reader for a tag in a fixed interval.
+
+    Single (4 byte), double (7 byte) and triple (10 byte) size UIDs are read
+    completely, by running the anticollision and select loop through all
+    cascade levels of ISO/IEC 14443-3.
+    '''
+
+    stages = ('wait', 'request', 'anticoll')
+
+    def __init__(self, mode='irq', poll_interval=0.1, retries=2, spi_speed=1000000):
+        '''
+        Constructor.
+
+        :param str mode: The reader mode (``irq`` or ``poll``)
+        :param float poll_interval: The poll interval in seconds
+        :param int retries: The number of immediate retries of a failed read
+        :param int spi_speed: The SPI clock speed in Hz
+        '''
+        # pylint: disable=import-error,import-outside-toplevel
+        from pirc522 import RFID
+        from RPi import GPIO
+
+        super().__init__()
+        self.gpio          = GPIO
+        self.rfid          = RFID(speed=spi_speed)
+        self.mode          = mode
+        self.poll_interval = poll_interval
+        self.retries       = retries
+        self.retried       = 0
+
+    def wait_for_tag(self, stop_event):
+        '''
+        Wait until a tag is touched.
+
+        In ``irq`` mode, this blocks until the IRQ of the RFID reader fires.
+        In ``poll`` mode, the poll interval is awaited and then the reader is
+        requested for a tag.
+
+        :param threading.Event stop_event: The stop event
+
+        :return: A tag is present
+        :rtype: bool
+        '''
+        if self.mode == 'irq':
+            self.rfid.wait_for_tag()
+            return True
+
+        if stop_event.wait(self.poll_interval):
+            return False
+
+        error, data = self.timed('request', self.rfid.request)  # pylint: disable=unused-variable
+        return not error
+
+    def read_uid(self):
+        '''
+        Return the UID from the tag.
+
+        Failed reads are retried immediately for the configured number of
+        retries. In ``poll`` mode, the tag was already requested while
+        waiting, thus the first request is skipped.
+
+        :return: The UID bytes
+        :rtype: bytes
+
+        :raises ReadError: When RFID tag couldn't be read
+        '''
+        rfid = self.rfid
+
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self.retried += 1
+
+            if attempt or self.mode == 'irq':
+                error, data = self.timed('request', rfid.request)  # pylint: disable=unused-variable
+                if error:
+                    continue
+
+            uid = self.timed('anticoll', self.anticoll)
+            if uid is None:
+                continue
+
+            return uid
+
+        raise ReadError('Could not read tag')
+
+    def anticoll(self):
+        '''
+        Run the anticollision and select loop through the cascade levels.
+
+        A cascade level returns four bytes and a check byte. When the first
+        byte is the cascade tag, the next three bytes belong to the UID and
+        the UID continues on the next cascade level.
+
+        :return: The UID bytes or ``None`` on errors
+        :rtype: bytes
+        '''
+        rfid = self.rfid
+        uid  = b''
+
+        for level in CASCADE_LEVELS:
+            rfid.dev_write(0x0D, 0x00)
+            error, data, bits = rfid.card_write(rfid.mode_transrec, [level, 0x20])  # pylint: disable=unused-variable
+
+            if error or len(data) != 5 or data[0] ^ data[1] ^ data[2] ^ data[3] != data[4]:
+                return None
+
+            command = [level, 0x70, *data]
+            command.extend(rfid.calculate_crc(command))
+            error, sak, bits = rfid.card_write(rfid.mode_transrec, command)
+
+            if error or bits != 0x18:
+                return None
+
+            if data[0] == CASCADE_TAG and sak[0] & 0x04:
+                uid += bytes(data[1:4])
+                continue
+
+            return uid + bytes(data[0:4])
+
+        return None
+
+    def close(self):
+        '''
+        Clean up the GPIO pins of the RFID reader.
+        '''
+        self.gpio.cleanup()  # pylint: disable=no-member
+
+    def as_dict(self):
+        '''
+        Dict representation of the reader status.
+
+        :return: The dict version of the status
+        :rtype: dict
+        '''
+        return {
+            **super().as_dict(),
+            'mode': self.mode,
+            'poll_interval': self.poll_interval,
+            'retries': self.retries,
+            'retried': self.retried,
+        }
@@ -0,0 +1,94 @@
+'''
+Python module for the Mopidy Pummeluff simulated reader.
+'''
+
+__all__ = (
+    'SimulatedReader',
+)
+
+from itertools import cycle
+
+from mopidy_pummeluff.uid import parse_uid
+
+from .base import Reader, ReadError
+
+
+class SimulatedReader(Reader):
+    '''
+    Reader backend which replays a sequence of UIDs at a fixed rate.
+
+    It doesn't require any hardware, thus it can be used to test and
+    benchmark the whole scan to action pipeline on any machine.
+    '''
+
+    stages = ('wait',)
+
+    def __init__(self, uids, rate=1, repeat=True):
+        '''
+        Constructor.
+
+        An empty UID in the sequence simulates a read error.
+
+        :param list uids: The hex UIDs
+        :param float rate: The number of scans per second (``0`` for as fast
+            as possible)
+        :param bool repeat: Repeat the sequence endlessly
+
+        :raises ValueError: When a UID is invalid
+        '''
+        super().__init__()
+        self.uids     = [parse_uid(uid) if uid else b'' for uid in uids]
+        self.rate     = rate
+        self.repeat   = repeat
+        self.sequence = cycle(self.uids) if repeat else iter(self.uids)
+        self.current  = None
+        self.replayed = 0
+
+    def wait_for_tag(self, stop_event):
+        '''
+        Wait for the next scan according to the rate.
+
+        :param threading.Event stop_event: The stop event
+
+        :return: A tag is present
+        :rtype: bool
+        '''
+        if self.rate and stop_event.wait(1 / self.rate):
+            return False
+
+        self.current = next(self.sequence, None)
+
+        if self.current is None:
+            stop_event.wait(1)
+            return False
+
+        self.replayed += 1
+        return True
+
+    def read_uid(self):
+        '''
+        Return the current UID of the sequence.
+
+        :return: The UID bytes
+        :rtype: bytes
+
+        :raises ReadError: When the UID is empty
+        '''
+        if not self.current:
+            raise ReadError('Simulated read error')
+
+        return self.current
+
+    def as_dict(self):
+        '''
+        Dict representation of the reader status.
+
+        :return: The dict version of the status
+        :rtype: dict
+        '''
+        return {
+            **super().as_dict(),
+            'rate': self.rate,
+            'repeat': self.repeat,
+            'replayed': self.replayed,
+        }
@@ -3,54 +3,180 @@ Python module for Mopidy Pummeluff registry.
 '''
 
 __all__ = (
+    'TagImportError',
     'RegistryDict',
     'REGISTRY',
 )
 
+import csv
 import json
-import os
+from io import StringIO
 from logging import getLogger
+from sys import intern
+from threading import Lock
+from uuid import uuid4
 
 from mopidy_pummeluff import actions
+from mopidy_pummeluff.storage import JournalStorage
+from mopidy_pummeluff.targets import TARGETS
+from mopidy_pummeluff.uid import CASCADE_TAG, MIN_UID_LENGTH, format_uid, legacy_uid, parse_uid
 
 LOGGER = getLogger(__name__)
 
+FIELDS = ('uid', 'action', 'alias', 'parameter')
+
+
+class TagImportError(ValueError):
+    '''
+    Exception which is thrown when tags couldn't be imported into the
+    registry.
+    '''
+
+    def __init__(self, message, errors=None):
+        '''
+        Constructor.
+
+        :param str message: The error message
+        :param list errors: The errors per row
+        '''
+        super().__init__(message)
+        self.errors = errors or []
+
 
 class RegistryDict(dict):
     '''
     Class which can be used to retreive and write RFID tags to the registry.
+
+    The registry is persisted in a :py:class:`~mopidy_pummeluff.storage.JournalStorage`,
+    which means each registration or unregistration is only appended to a
+    journal, which is compacted into the registry file from time to time.
+
+    Every change of the registry increases its :py:attr:`generation`, which
+    can be used to detect changes (e.g. for caching).
+
+    The tags are indexed by their UID bytes (see :py:mod:`mopidy_pummeluff.uid`).
+    Tags which were registered with a legacy UID (i.e. truncated to four bytes
+    and not zero-padded) are kept in the :py:attr:`legacy` index, until they
+    are migrated on their next scan. Legacy UIDs of cascaded tags, which only
+    consisted of two-digit bytes, look canonical and are indexed by their
+    bytes instead (see :py:meth:`lookup`).
+
+    Tags which are read from disk are kept as compact records (i.e. tuples of
+    the action, UID, alias & parameter), which are hydrated into action
+    instances only when a tag is scanned. Listings, exports and compactions
+    are served from the records directly.
+
+    The registry is empty until it's opened (see :py:meth:`open`), so that
+    nothing is read from disk when the module is imported.
+
+    Tags are changed from different threads (e.g. migrated by the tag reader
+    while registered via the web API), thus all changes and their writes to
+    disk are serialised by the :py:attr:`lock`.
     '''
 
     registry_path = '/var/lib/mopidy/pummeluff/tags.json'
 
-    def __init__(self):
+    def __init__(self, registry_path=None):
         '''
         Constructor.
 
-        Automatically reads the registry if it exists.
+        :param str registry_path: The path of the registry file, which
+            defaults to :py:attr:`registry_path`
         '''
         super().__init__()
 
-        if os.path.exists(self.registry_path):
+        if registry_path is not None:
+            self.registry_path = registry_path
+
+        self.storage    = JournalStorage(self.registry_path)
+        self.token      = uuid4().hex[:8]
+        self.generation = 0
+        self.lock       = Lock()
+        self.cache_lock = Lock()
+        self.cache      = (None, [])
+        self.legacy     = {}
+
+    def open(self, registry_path=None):
+        '''
+        Open the registry, i.e. read it from disk if it exists.
+
+        :param str registry_path: The path of the registry file, which
+            replaces the current path
+        '''
+        if registry_path is not None and registry_path != self.registry_path:
+            self.registry_path = registry_path
+            self.storage       = JournalStorage(registry_path)
+
+        if self.storage.exists():
             self.read()
         else:
             LOGGER.warning('Registry not existing yet on "%s"', self.registry_path)
 
-    @classmethod
-    def unserialize_item(cls, item):
+    @staticmethod
+    def unserialize_item(item):
         '''
         Unserialize an item from the persistent storage on filesystem to a
-        native action.
+        compact record, which is hydrated on demand (see :py:meth:`hydrate`).
 
-        :param tuple item: The item
+        :param dict item: The item
 
-        :return: The action
-        :rtype: actions.Action
+        :return: The record
+        :rtype: tuple
         '''
         if 'action_class' in item:
             item['action'] = item.pop('action_class')
 
-        return item['uid'], cls.init_action(**item)
+        return (
+            intern(item['action']),
+            str(item['uid']).strip(),
+            item.get('alias') or None,
+            item.get('parameter') or None,
+        )
+
+    @staticmethod
+    def serialize_value(value):
+        '''
+        Serialize a registry value (i.e. an action instance or a record) to
+        the dict representation of the tag.
+
+        :param value: The value
+        :type value: actions.Action|tuple
+
+        :return: The dict version of the tag
+        :rtype: dict
+        '''
+        if not isinstance(value, tuple):
+            return value.as_dict()
+
+        action, uid, alias, parameter = value
+
+        return {
+            'action': action,
+            'uid': uid,
+            'alias': alias or '',
+            'parameter': parameter or '',
+        }
+
+    @classmethod
+    def hydrate(cls, record):
+        '''
+        Hydrate a record into an action instance and parse its parameter.
+
+        :param tuple record: The record
+
+        :return: The action instance
+        :rtype: actions.Action
+
+        :raises ValueError: When the action doesn't exist
+        '''
+        action = cls.init_action(*record)
+
+        try:
+            action.parse()
+        except ValueError as ex:
+            LOGGER.warning('Invalid parameter of tag %s: %s', action.uid, ex)
+
+        return action
 
     @classmethod
     def init_action(cls, action, uid, alias=None, parameter=None):
@@ -65,38 +191,244 @@ class RegistryDict(dict):
         :return: The action instance
         :rtype: actions.Action
         '''
-        uid    = str(uid).strip()
-        action = getattr(actions, action)
+        uid = str(uid).strip()
 
-        return action(uid, alias, parameter)
+        return actions.CATALOG.get(action)(uid, alias, parameter)
 
     def read(self):
         '''
         Read registry from disk.
 
-        :raises IOError: When registry file on disk is missing
+        :raises IOError: When registry file on disk can't be read
         '''
         LOGGER.debug('Reading registry from %s', self.registry_path)
 
-        with open(self.registry_path, 'r', encoding='utf-8') as file:
-            data = json.load(file)
+        data = self.storage.load()
+
+        with self.lock:
             self.clear()
-            self.update((self.unserialize_item(item) for item in data))
+            self.legacy.clear()
+
+            for item in data:
+                record = self.unserialize_item(item)
+                uid    = record[1]
+
+                try:
+                    key = parse_uid(uid)
+                except ValueError:
+                    key = None
+
+                # Only canonical UIDs are indexed by their bytes (see is_canonical_uid).
+                if key is not None and format_uid(key) == uid:
+                    super().__setitem__(key, record)
+                else:
+                    self.legacy[uid] = record
+
+            self.generation += 1
+
+        if self.legacy:
+            LOGGER.info('%d tags with legacy UIDs will be migrated on their next scan', len(self.legacy))
 
     def write(self):
         '''
-        Write registry to disk.
+        Write the whole registry atomically to disk and clear the journal.
+
+        The :py:attr:`lock` must be held by the caller.
         '''
         LOGGER.debug('Writing registry to %s', self.registry_path)
+        self.storage.compact(self.serialize_value(value) for value in self.all_values())
+
+    def __getitem__(self, key):
+        '''
+        Return the action of a tag, which is hydrated on first access.
+
+        :param bytes key: The UID bytes
+
+        :return: The action instance
+        :rtype: actions.Action
+
+        :raises KeyError: When the tag isn't registered
+        :raises ValueError: When the action of the tag doesn't exist
+        '''
+        value = super().__getitem__(key)
+
+        if isinstance(value, tuple):
+            value = self.hydrate(value)
+            super().__setitem__(key, value)
+
+        return value
+
+    def all_values(self):
+        '''
+        Return the values (i.e. action instances or records) of all tags,
+        including the legacy ones, without hydrating them.
+
+        :return: The values
+        :rtype: list
+        '''
+        return list(self.values()) + list(self.legacy.values())
+
+    def all_actions(self):
+        '''
+        Return the actions of all tags, including the legacy ones, which
+        hydrates all of them.
+
+        Tags with an action which doesn't exist are skipped.
+
+        :return: The action instances
+        :rtype: list[actions.Action]
+        '''
+        instances = []
+
+        for key in list(self):
+            try:
+                instances.append(self[key])
+            except ValueError as ex:
+                LOGGER.error('Could not load tag %s: %s', format_uid(key), ex)
+
+        for uid, action in list(self.legacy.items()):
+            if isinstance(action, tuple):
+                try:
+                    action = self.legacy[uid] = self.hydrate(action)
+                except ValueError as ex:
+                    LOGGER.error('Could not load tag %s: %s', uid, ex)
+                    continue
+
+            instances.append(action)
+
+        return instances
+
+    def all_targets(self):
+        '''
+        Return the target URIs of all tags, including the legacy ones,
+        without hydrating them (see :py:meth:`actions.Action.find_targets`).
+
+        Tags with an action which doesn't exist or an invalid parameter are
+        skipped.
+
+        :return: The target URIs
+        :rtype: list[str]
+        '''
+        targets = []
+
+        for value in self.all_values():
+            if not isinstance(value, tuple):
+                targets.extend(value.targets)
+                continue
+
+            action, _, _, parameter = value
+
+            if not parameter:
+                continue
+
+            try:
+                action_class = actions.CATALOG.get(action)
+                targets.extend(action_class.find_targets(action_class.schema.parse(parameter)))
+            except ValueError:
+                continue
+
+        return targets
+
+    def lookup(self, uid):
+        '''
+        Return the action of a scanned tag.
+
+        When the tag isn't registered with its UID, but with its legacy UID,
+        the tag is migrated to its UID. Because legacy UIDs are ambiguous, the
+        first scanned tag which matches the legacy UID wins.
+
+        The legacy UID of a cascaded tag (i.e. the cascade tag followed by the
+        first three bytes) looks canonical, when all its bytes had two hex
+        digits. Thus such a tag is also looked up by these bytes.
+
+        :param bytes uid: The UID bytes
+
+        :return: The action instance
+        :rtype: actions.Action
+
+        :raises KeyError: When the tag isn't registered or its action doesn't
+            exist
+        '''
+        try:
+            return self[uid]
+        except ValueError as ex:
+            LOGGER.error('Could not load tag %s: %s', format_uid(uid), ex)
+            raise KeyError(uid) from ex
+        except KeyError:
+            pass
+
+        legacy   = legacy_uid(uid)
+        cascaded = bytes((CASCADE_TAG,)) + uid[:3]
+
+        with self.lock:
+            if legacy in self.legacy:
+                index, key = self.legacy, legacy
+            elif len(uid) > MIN_UID_LENGTH and cascaded in self:
+                index, key = self, cascaded
+            else:
+                raise KeyError(uid)
+
+            action = dict.get(index, key)
+
+            if isinstance(action, tuple):
+                try:
+                    action = self.hydrate(action)
+                except ValueError as ex:
+                    LOGGER.error('Could not load tag %s: %s', legacy, ex)
+                    raise KeyError(uid) from ex
+
+            del index[key]
+
+            action.uid = format_uid(uid)
+
+            LOGGER.info('Migrating legacy UID %s to %s', legacy, action.uid)
+
+            self[uid] = action
+            self.generation += 1
+            self.persist({'op': 'unregister', 'uid': legacy}, {'op': 'register', **action.as_dict()})
+
+        return action
+
+    @property
+    def etag(self):
+        '''
+        Strong entity tag of the current registry generation.
+
+        :return: The entity tag
+        :rtype: str
+        '''
+        return f'"{self.token}-{self.generation}"'
+
+    def as_list(self):
+        '''
+        List representation of all tags.
 
-        config    = self.registry_path
-        directory = os.path.dirname(config)
+        The list is cached until the registry changes, thus it must not be
+        modified.
 
-        if not os.path.exists(directory):
-            os.makedirs(directory)
+        :return: The dict versions of the tags
+        :rtype: list[dict]
+        '''
+        with self.cache_lock:
+            generation, tags = self.cache
+
+            if generation != self.generation:
+                generation = self.generation
+                tags       = [self.serialize_value(value) for value in self.all_values()]
+                self.cache = (generation, tags)
 
-        with open(config, 'w', encoding='utf-8') as file:
-            json.dump([action.as_dict() for action in self.values()], file, indent=4)
+            return tags
+
+    def persist(self, *records):
+        '''
+        Append records to the journal on disk, and compact it if required.
+
+        The :py:attr:`lock` must be held by the caller.
+
+        :param dict \\*records: The journal records
+        '''
+        if len(records) >= self.storage.compact_threshold or self.storage.append(*records):
+            self.write()
 
     def register(self, action, uid, alias=None, parameter=None):
         '''
@@ -110,13 +442,16 @@ class RegistryDict(dict):
         :return: The action instance
         :rtype: actions.Action
 
-        :raises ValueError: When UID is not defined
+        :raises ValueError: When UID is not defined or invalid
         '''
         LOGGER.info('Registering %s tag %s with parameter "%s"', action, uid, parameter)
 
         if not uid:
             raise ValueError('UID required to register a tag')
 
+        key = parse_uid(uid)
+        uid = format_uid(key)
+
         action_instance = self.init_action(
             action=action,
             uid=uid,
@@ -126,8 +461,12 @@ class RegistryDict(dict):
 
         action_instance.validate()
 
-        self[uid] = action_instance
-        self.write()
+        with self.lock:
+            self[key] = action_instance
+            self.generation += 1
+            self.persist({'op': 'register', **action_instance.as_dict()})
+
+        TARGETS.schedule(action_instance.targets)
 
         return action_instance
 
@@ -144,11 +483,162 @@ class RegistryDict(dict):
 
         LOGGER.info('Unregistering tag %s', uid)
 
-        if uid not in self:
-            raise ValueError('UID not registered')
+        with self.lock:
+            if uid in self.legacy:
+                del self.legacy[uid]
+            else:
+                try:
+                    key = parse_uid(uid)
+                except ValueError as ex:
+                    raise ValueError('UID not registered') from ex
+
+                if key not in self:
+                    raise ValueError('UID not registered')
+
+                del self[key]
+                uid = format_uid(key)
+
+            self.generation += 1
+            self.persist({'op': 'unregister', 'uid': uid})
+
+    def register_many(self, items):
+        '''
+        Register multiple tags in the registry at once.
+
+        All tags are validated first. Only when all of them are valid, they're
+        registered and persisted with a single write.
+
+        :param iterable items: The items, each as dict with the keys ``uid``,
+            ``action``, ``alias`` & ``parameter``
+
+        :return: The action instances
+        :rtype: list[actions.Action]
+
+        :raises TagImportError: When one or more items are invalid
+        '''
+        instances = {}
+        errors    = []
+
+        for row, item in enumerate(items, start=1):
+            uid = str(item.get('uid') or '').strip()
+
+            try:
+                if not uid:
+                    raise ValueError('UID required to register a tag')
+
+                key = parse_uid(uid)
+
+                if key in instances:
+                    raise ValueError('UID defined multiple times')
+
+                action_instance = self.init_action(
+                    action=item.get('action') or '',
+                    uid=format_uid(key),
+                    alias=item.get('alias') or None,
+                    parameter=item.get('parameter') or None,
+                )
+
+                action_instance.validate()
+
+            except ValueError as ex:
+                errors.append({'row': row, 'uid': uid, 'message': str(ex)})
+                continue
+
+            instances[key] = action_instance
+
+        if errors:
+            raise TagImportError(f'{len(errors)} of {row} tags are invalid', errors)
+
+        if not instances:
+            return []
+
+        LOGGER.info('Registering %d tags', len(instances))
+
+        with self.lock:
+            self.update(instances)
+            self.generation += 1
+            self.persist(*({'op': 'register', **action.as_dict()} for action in instances.values()))
+
+        for action_instance in instances.values():
+            TARGETS.schedule(action_instance.targets)
+
+        return list(instances.values())
+
+    def import_tags(self, data, data_format='json'):
+        '''
+        Import tags from a JSON or CSV document into the registry.
+
+        A JSON document must contain a list of objects, a CSV document must
+        have a header row. Both use the fields ``uid``, ``action``, ``alias``
+        & ``parameter``.
+
+        :param str data: The document
+        :param str data_format: The format of the document (``json`` or ``csv``)
+
+        :return: The action instances
+        :rtype: list[actions.Action]
+
+        :raises TagImportError: When document or items are invalid
+        '''
+        if data_format == 'csv':
+            items = list(csv.DictReader(StringIO(data)))
+
+        elif data_format == 'json':
+            try:
+                items = json.loads(data)
+            except ValueError as ex:
+                raise TagImportError(f'Invalid JSON document: {ex}') from ex
+
+            if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+                raise TagImportError('JSON document must contain a list of objects')
+
+        else:
+            raise TagImportError(f'Unsupported format {data_format}')
+
+        return self.register_many(items)
+
+    def export_tags(self, data_format='json', chunk_size=100):
+        '''
+        Export all tags of the registry as JSON or CSV document.
+
+        The document is generated in chunks, so that it can be streamed.
+
+        :param str data_format: The format of the document (``json`` or ``csv``)
+        :param int chunk_size: The number of tags per chunk
+
+        :return: The document chunks
+        :rtype: generator
+        '''
+        values = self.all_values()
+        chunks = (
+            [self.serialize_value(value) for value in values[index:index + chunk_size]]
+            for index in range(0, len(values), chunk_size)
+        )
+
+        if data_format == 'csv':
+            buffer = StringIO()
+            writer = csv.DictWriter(buffer, FIELDS, extrasaction='ignore', lineterminator='\n')
+            writer.writeheader()
+
+            for chunk in chunks:
+                writer.writerows(chunk)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+            if buffer.tell():
+                yield buffer.getvalue()
+
+        else:
+            separator = ''
+
+            yield '['
+
+            for chunk in chunks:
+                yield separator + ','.join(json.dumps(tag) for tag in chunk)
+                separator = ','
 
-        del self[uid]
-        self.write()
+            yield ']'
 
 
 REGISTRY = RegistryDict()
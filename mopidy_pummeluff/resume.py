@@ -0,0 +1,321 @@
+'''
+Python module for Mopidy Pummeluff playback resumption.
+'''
+
+__all__ = (
+    'POLICIES',
+    'fingerprint',
+    'index_tlids',
+    'LoadedTracklist',
+    'ResumeStore',
+    'LOADED',
+    'RESUME',
+)
+
+import json
+import os
+from hashlib import blake2b
+from logging import getLogger
+from threading import Lock, Timer
+
+from mopidy_pummeluff.storage import fsync_directory
+
+LOGGER = getLogger(__name__)
+
+#: The policies when a tag is rescanned while its tracklist is still loaded.
+POLICIES = ('resume', 'restart', 'next')
+
+
+def fingerprint(uris):
+    '''
+    Return the fingerprint of the resolved track URIs of a tag, which changes
+    when the content of the tag changes (e.g. when a playlist was modified).
+
+    :param list[str] uris: The track URIs
+
+    :return: The fingerprint
+    :rtype: str
+    '''
+    digest = blake2b(digest_size=8)
+
+    for uri in uris:
+        digest.update(uri.encode('utf-8'))
+        digest.update(b'\n')
+
+    return digest.hexdigest()
+
+
+def index_tlids(uri, tlids):
+    '''
+    Index the tracklist IDs of the tracks of a tag by their position.
+
+    :param str uri: The URI of the tag's parameter
+    :param list[tuple] tlids: The tracklist IDs per track URI, which are
+        ``None`` for track URIs which aren't loaded yet
+
+    :return: The URI, the index of the track URI and the offset of the track
+        within the track URI by tracklist ID
+    :rtype: dict
+    '''
+    return {
+        tlid: (uri, index, offset)
+        for index, uri_tlids in enumerate(tlids) if uri_tlids
+        for offset, tlid in enumerate(uri_tlids)
+    }
+
+
+class LoadedTracklist:
+    '''
+    The tracklist which was loaded by a tag, so that the playback state can
+    be recorded for the tag and a rescan of the tag can be detected.
+
+    A tracklist is considered as loaded as long as the tracklist version is
+    unchanged and the tag still resolves to the same track URIs (i.e. the
+    same fingerprint). The :py:attr:`policy` defines what happens when a tag
+    is rescanned while its tracklist is loaded (see :py:data:`POLICIES`).
+
+    The tracks are indexed per track URI, which can resolve to no track
+    (e.g. an unavailable track) or to several tracks (e.g. an album), thus
+    the position of a track is its index and its offset within the tracks of
+    its track URI.
+
+    The track IDs of the previously loaded tracklist are kept as well,
+    because its playback events usually arrive after the next tracklist was
+    loaded already (e.g. when the tracklist is cleared while playing).
+    '''
+
+    def __init__(self):
+        '''
+        Constructor.
+        '''
+        self.lock        = Lock()
+        self.policy      = 'resume'
+        self.uri         = None
+        self.fingerprint = None
+        self.version     = None
+        self.order       = []
+        self.tlids       = {}
+        self.previous    = {}
+        self.rescans     = 0
+
+    def set(self, uri, uris, tlids, version):
+        '''
+        Set the loaded tracklist.
+
+        :param str uri: The URI of the tag's parameter
+        :param list[str] uris: The resolved track URIs
+        :param list[tuple] tlids: The tracklist IDs per track URI, which
+            are ``None`` for track URIs which aren't loaded yet
+        :param int version: The tracklist version after loading
+        '''
+        with self.lock:
+            self.previous    = self.tlids
+            self.uri         = uri
+            self.fingerprint = fingerprint(uris)
+            self.version     = version
+            self.order       = list(tlids)
+            self.tlids       = index_tlids(uri, tlids)
+
+    def update(self, tlids, version):
+        '''
+        Update the loaded tracklist after more of its tracks were loaded
+        (see :py:class:`~mopidy_pummeluff.threads.TracklistLoader`).
+
+        :param list[tuple] tlids: The tracklist IDs per track URI, which
+            are ``None`` for track URIs which aren't loaded yet
+        :param int version: The tracklist version after loading
+        '''
+        with self.lock:
+            self.version = version
+            self.order   = list(tlids)
+            self.tlids   = index_tlids(self.uri, tlids)
+
+    def clear(self):
+        '''
+        Forget the loaded tracklist (e.g. when it was replaced by someone
+        else).
+        '''
+        with self.lock:
+            self.uri         = None
+            self.fingerprint = None
+            self.version     = None
+
+    def is_loaded(self, uri, uris, version):
+        '''
+        Check if the tracklist of a URI is still loaded.
+
+        :param str uri: The URI of the tag's parameter
+        :param list[str] uris: The resolved track URIs
+        :param int version: The current tracklist version
+
+        :return: Tracklist is loaded
+        :rtype: bool
+        '''
+        with self.lock:
+            if self.uri != uri or self.version != version:
+                return False
+
+        return fingerprint(uris) == self.fingerprint
+
+    def lookup(self, tlid):
+        '''
+        Return the URI and position of a loaded track.
+
+        :param int tlid: The tracklist ID of the track
+
+        :return: The URI, the index and the offset or ``None``
+        :rtype: tuple
+        '''
+        with self.lock:
+            return self.tlids.get(tlid) or self.previous.get(tlid)
+
+    def as_dict(self):
+        '''
+        Dict representation of the loaded tracklist.
+
+        :return: The dict version of the loaded tracklist
+        :rtype: dict
+        '''
+        with self.lock:
+            return {
+                'policy': self.policy,
+                'uri': self.uri,
+                'fingerprint': self.fingerprint,
+                'version': self.version,
+                'tracks': len(self.tlids) if self.uri else 0,
+                'rescans': self.rescans,
+            }
+
+
+class ResumeStore:
+    '''
+    Store of the playback position (i.e. the index of the track URI, the time
+    position and the offset of the track within its track URI, see
+    :py:class:`LoadedTracklist`) per tag URI.
+
+    Positions are recorded in memory, and persisted to a compact JSON file in
+    batches after the flush interval, instead of on every playback event.
+    The least recently recorded positions are dropped when the store is full.
+    '''
+
+    resume_path = '/var/lib/mopidy/pummeluff/resume.json'
+
+    def __init__(self, flush_interval=30, size=500):
+        '''
+        Constructor.
+
+        :param float flush_interval: The interval in seconds to persist
+            recorded positions
+        :param int size: The maximum number of positions
+        '''
+        self.lock           = Lock()
+        self.enabled        = True
+        self.flush_interval = flush_interval
+        self.size           = size
+        self.positions      = {}
+        self.timer          = None
+        self.flushes        = 0
+
+    def load(self):
+        '''
+        Load the positions from disk, if the file exists.
+        '''
+        if not os.path.exists(self.resume_path):
+            return
+
+        try:
+            with open(self.resume_path, 'r', encoding='utf-8') as file:
+                positions = json.load(file)
+        except (OSError, ValueError) as ex:
+            LOGGER.warning('Could not read resume positions: %s', ex)
+            return
+
+        with self.lock:
+            # Earlier versions didn't record the offset.
+            self.positions = {uri: (*position, 0)[:3] for uri, position in positions.items()}
+
+    def get(self, uri):
+        '''
+        Return the recorded position of a URI.
+
+        :param str uri: The URI of the tag's parameter
+
+        :return: The index, the time position in ms and the offset or ``None``
+        :rtype: tuple
+        '''
+        return self.positions.get(uri) if self.enabled else None
+
+    def set(self, uri, index, time_position, offset=0):
+        '''
+        Record the position of a URI and schedule a flush.
+
+        :param str uri: The URI of the tag's parameter
+        :param int index: The index of the track URI
+        :param int time_position: The time position in ms
+        :param int offset: The offset of the track within its track URI
+        '''
+        if not self.enabled:
+            return
+
+        with self.lock:
+            self.positions.pop(uri, None)
+            self.positions[uri] = (index, time_position, offset)
+
+            while len(self.positions) > self.size:
+                del self.positions[next(iter(self.positions))]
+
+            if self.timer is None:
+                self.timer = Timer(self.flush_interval, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def flush(self):
+        '''
+        Persist the positions atomically to disk, if there are unsaved ones.
+        '''
+        with self.lock:
+            if self.timer is None:
+                return
+
+            self.timer.cancel()
+            self.timer = None
+            data       = json.dumps(self.positions, separators=(',', ':'))
+
+        LOGGER.debug('Writing resume positions to %s', self.resume_path)
+
+        directory = os.path.dirname(self.resume_path)
+        temp_path = f'{self.resume_path}.tmp'
+
+        try:
+            os.makedirs(directory, exist_ok=True)
+
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                file.write(data)
+                file.flush()
+                os.fsync(file.fileno())
+
+            os.replace(temp_path, self.resume_path)
+            fsync_directory(directory)
+        except OSError as ex:
+            LOGGER.error('Could not write resume positions: %s', ex)
+            return
+
+        self.flushes += 1
+
+    def as_dict(self):
+        '''
+        Dict representation of the resume status.
+
+        :return: The dict version of the status
+        :rtype: dict
+        '''
+        return {
+            'enabled': self.enabled,
+            'positions': len(self.positions),
+            'pending': self.timer is not None,
+            'flushes': self.flushes,
+        }
+
+
+LOADED = LoadedTracklist()
+RESUME = ResumeStore()
@@ -3,17 +3,357 @@ Python module to play sounds.
 '''
 
 __all__ = (
+    'Sound',
+    'SoundBackend',
+    'NullBackend',
+    'RecordingBackend',
+    'AplayBackend',
+    'AlsaBackend',
+    'SoundPlayer',
+    'BACKENDS',
+    'create_backend',
+    'start_player',
+    'stop_player',
     'play_sound',
 )
 
-from os import path, system
+import wave
+from logging import getLogger
+from os import listdir, path
+from queue import Full, Queue
+from subprocess import DEVNULL, PIPE, Popen
+from threading import Lock, Thread
+
+LOGGER = getLogger(__name__)
+
+SOUNDS_DIR = path.join(path.dirname(__file__), 'sounds')
+
+
+class Sound:  # pylint: disable=too-few-public-methods
+    '''
+    A sound which is decoded once and then kept as raw PCM data in memory.
+    '''
+
+    def __init__(self, file_path):
+        '''
+        Constructor.
+
+        :param str file_path: The path to the WAV file
+        '''
+        self.name = path.basename(file_path)
+
+        with wave.open(file_path, 'rb') as file:
+            self.channels     = file.getnchannels()
+            self.sample_width = file.getsampwidth()
+            self.rate         = file.getframerate()
+            self.frames       = file.readframes(file.getnframes())
+
+    def __repr__(self):
+        '''
+        Instance representation of the sound.
+
+        :return: The class name and sound name
+        :rtype: str
+        '''
+        return f'<{self.__class__.__name__} {self.name}>'
+
+    @property
+    def duration(self):
+        '''
+        The duration of the sound in seconds.
+
+        :return: The duration
+        :rtype: float
+        '''
+        return len(self.frames) / (self.rate * self.channels * self.sample_width)
+
+
+class SoundBackend:
+    '''
+    Base sound backend which outputs decoded sounds.
+    '''
+
+    def play(self, sound):
+        '''
+        Play a sound.
+
+        :param Sound sound: The sound
+
+        :raises NotImplementedError: When method is not implemented
+        '''
+        raise NotImplementedError(f'Missing play method in the {self.__class__.__name__} class')
+
+    def close(self):
+        '''
+        Release all resources of the backend.
+        '''
+
+
+class NullBackend(SoundBackend):
+    '''
+    Sound backend which silently discards all sounds.
+    '''
+
+    def play(self, sound):
+        '''
+        Discard the sound.
+
+        :param Sound sound: The sound
+        '''
+
+
+class RecordingBackend(SoundBackend):
+    '''
+    Sound backend which records the names of the played sounds instead of
+    outputting them.
+    '''
+
+    def __init__(self):
+        '''
+        Constructor.
+        '''
+        self.played = []
+
+    def play(self, sound):
+        '''
+        Record the sound.
+
+        :param Sound sound: The sound
+        '''
+        self.played.append(sound.name)
+
+
+class AplayBackend(SoundBackend):
+    '''
+    Sound backend which pipes the decoded PCM data into ``aplay``, so that
+    neither a shell is spawned nor the WAV file is read again.
+    '''
+
+    formats = {
+        1: 'U8',
+        2: 'S16_LE',
+        3: 'S24_3LE',
+        4: 'S32_LE',
+    }
+
+    def play(self, sound):
+        '''
+        Play a sound via aplay.
+
+        :param Sound sound: The sound
+        '''
+        command = (
+            'aplay', '-q', '-t', 'raw',
+            '-f', self.formats[sound.sample_width],
+            '-r', str(sound.rate),
+            '-c', str(sound.channels),
+            '-',
+        )
+
+        with Popen(command, stdin=PIPE, stdout=DEVNULL, stderr=DEVNULL) as process:
+            process.communicate(sound.frames)
+
+
+class AlsaBackend(SoundBackend):
+    '''
+    Sound backend which writes the decoded PCM data directly to an ALSA device
+    via the optional ``alsaaudio`` module.
+    '''
+
+    def __init__(self, device='default'):
+        '''
+        Constructor.
+
+        :param str device: The ALSA device name
+
+        :raises ImportError: When ``alsaaudio`` is not installed
+        '''
+        import alsaaudio  # pylint: disable=import-error,import-outside-toplevel
+
+        self.alsaaudio = alsaaudio
+        self.device    = device
+        self.formats   = {
+            1: alsaaudio.PCM_FORMAT_U8,
+            2: alsaaudio.PCM_FORMAT_S16_LE,
+            3: alsaaudio.PCM_FORMAT_S24_3LE,
+            4: alsaaudio.PCM_FORMAT_S32_LE,
+        }
+
+    def play(self, sound):
+        '''
+        Play a sound via ALSA.
+
+        The PCM device is only opened while the sound is played, so that it's
+        not blocked for Mopidy's own audio output.
+
+        :param Sound sound: The sound
+        '''
+        pcm = self.alsaaudio.PCM(
+            type=self.alsaaudio.PCM_PLAYBACK,
+            device=self.device,
+            channels=sound.channels,
+            rate=sound.rate,
+            format=self.formats[sound.sample_width],
+        )
+
+        try:
+            pcm.write(sound.frames)
+        finally:
+            pcm.close()
+
+
+BACKENDS = {
+    'null': NullBackend,
+    'recording': RecordingBackend,
+    'aplay': AplayBackend,
+    'alsa': AlsaBackend,
+}
+
+
+class SoundPlayer(Thread):
+    '''
+    Thread which plays the queued sounds via a sound backend, so that the
+    callers are not blocked until a sound has been played.
+    '''
+
+    daemon = True
+
+    def __init__(self, backend, sounds_dir=SOUNDS_DIR, queue_size=4):
+        '''
+        Class constructor.
+
+        All WAV files in the sounds directory are decoded right away.
+
+        :param SoundBackend backend: The sound backend
+        :param str sounds_dir: The directory with the WAV files
+        :param int queue_size: The maximum number of queued sounds
+        '''
+        super().__init__(name='PummeluffSoundPlayer')
+        self.backend = backend
+        self.queue   = Queue(maxsize=queue_size)
+        self.sounds  = {
+            name: Sound(path.join(sounds_dir, name))
+            for name in sorted(listdir(sounds_dir))
+            if name.endswith('.wav')
+        }
+
+        LOGGER.debug('Loaded sounds %s', ', '.join(self.sounds))
+
+    def play(self, sound):
+        '''
+        Queue a sound for playing and return immediately.
+
+        If the queue is full, the sound is dropped, because outdated feedback
+        isn't of any use.
+
+        :param str sound: The name of the sound file
+
+        :raises KeyError: When sound doesn't exist
+        '''
+        try:
+            self.queue.put_nowait(self.sounds[sound])
+        except Full:
+            LOGGER.debug('Sound queue is full, dropping sound %s', sound)
+
+    def stop(self):
+        '''
+        Tell the thread to stop after the currently playing sound.
+        '''
+        self.queue.put(None)
+
+    def run(self):
+        '''
+        Run the sound playing loop.
+        '''
+        while True:
+            sound = self.queue.get()
+
+            if sound is None:
+                break
+
+            try:
+                self.backend.play(sound)
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception('Could not play sound %s', sound.name)
+
+        self.backend.close()
+
+
+PLAYER      = None
+PLAYER_LOCK = Lock()
+
+
+def create_backend(name='auto'):
+    '''
+    Create a sound backend by its name.
+
+    The ``auto`` backend uses ALSA when ``alsaaudio`` is installed and falls
+    back to ``aplay`` otherwise.
+
+    :param str name: The backend name
+
+    :return: The sound backend
+    :rtype: SoundBackend
+    '''
+    if name != 'auto':
+        return BACKENDS[name]()
+
+    try:
+        return AlsaBackend()
+    except ImportError:
+        LOGGER.debug('Python module alsaaudio not installed, falling back to aplay')
+        return AplayBackend()
+
+
+def start_player(backend='auto'):
+    '''
+    Start the global sound player.
+
+    :param backend: The sound backend or its name
+    :type backend: SoundBackend|str
+
+    :return: The sound player
+    :rtype: SoundPlayer
+    '''
+    global PLAYER  # pylint: disable=global-statement
+
+    if isinstance(backend, str):
+        backend = create_backend(backend)
+
+    with PLAYER_LOCK:
+        if PLAYER is not None:
+            PLAYER.stop()
+
+        PLAYER = SoundPlayer(backend=backend)
+        PLAYER.start()
+
+    return PLAYER
+
+
+def stop_player():
+    '''
+    Stop the global sound player.
+    '''
+    global PLAYER  # pylint: disable=global-statement
+
+    with PLAYER_LOCK:
+        if PLAYER is not None:
+            PLAYER.stop()
+            PLAYER = None
 
 
 def play_sound(sound):
     '''
-    Play sound via aplay.
+    Play a sound without blocking the caller.
+
+    The global sound player is started with the default backend, if it's not
+    running yet.
 
     :param str sound: The name of the sound file
     '''
-    file_path = path.join(path.dirname(__file__), 'sounds', sound)
-    system(f'aplay -q {file_path}')
+    player = PLAYER or start_player()
+
+    try:
+        player.play(sound)
+    except KeyError:
+        LOGGER.error('Sound %s not found', sound)
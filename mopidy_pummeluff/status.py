@@ -0,0 +1,52 @@
+'''
+Python module for Mopidy Pummeluff status.
+'''
+
+__all__ = (
+    'StatusDict',
+    'STATUS',
+)
+
+from logging import getLogger
+
+LOGGER = getLogger(__name__)
+
+
+class StatusDict(dict):
+    '''
+    Class which holds the status providers of the different subsystems.
+
+    A status provider is a callable which returns a JSON-serialisable dict
+    representation of the current status of its subsystem.
+    '''
+
+    def register(self, name, provider):
+        '''
+        Register a status provider.
+
+        :param str name: The name of the subsystem
+        :param callable provider: The status provider
+        '''
+        LOGGER.debug('Registering status provider %s', name)
+        self[name] = provider
+
+    def unregister(self, name):
+        '''
+        Unregister a status provider.
+
+        :param str name: The name of the subsystem
+        '''
+        LOGGER.debug('Unregistering status provider %s', name)
+        self.pop(name, None)
+
+    def as_dict(self):
+        '''
+        Dict representation of the status of all subsystems.
+
+        :return: The dict version of the status
+        :rtype: dict
+        '''
+        return {name: provider() for name, provider in list(self.items())}
+
+
+STATUS = StatusDict()
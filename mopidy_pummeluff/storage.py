@@ -0,0 +1,176 @@
+'''
+Python module for Mopidy Pummeluff registry storage.
+'''
+
+__all__ = (
+    'JournalStorage',
+)
+
+import json
+import os
+from logging import getLogger
+
+LOGGER = getLogger(__name__)
+
+
+def fsync_directory(directory):
+    '''
+    Flush the directory entries of a directory to disk, so that renames and
+    newly created files survive a power cut.
+
+    :param str directory: The directory
+    '''
+    try:
+        descriptor = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
+
+
+class JournalStorage:
+    '''
+    Storage which persists registry items in a snapshot file and an
+    append-only journal.
+
+    Every mutation is appended as a single JSON line to the journal and
+    flushed to disk, so it only costs one small write. Once the journal
+    reaches a certain size, it's compacted into a new snapshot, which is
+    written atomically via a temporary file and a rename.
+    '''
+
+    def __init__(self, path, compact_threshold=1000):
+        '''
+        Constructor.
+
+        :param str path: The path to the snapshot file
+        :param int compact_threshold: The number of journal records which
+            triggers a compaction
+        '''
+        self.path              = path
+        self.journal_path      = f'{path}.journal'
+        self.compact_threshold = compact_threshold
+        self.journal_records   = 0
+
+    def exists(self):
+        '''
+        Check if the storage exists on disk.
+
+        :return: Snapshot or journal exists
+        :rtype: bool
+        '''
+        return os.path.exists(self.path) or os.path.exists(self.journal_path)
+
+    def load(self):
+        '''
+        Load all items from the snapshot and replay the journal.
+
+        A truncated or corrupt journal record (e.g. because of a power cut
+        while it was written) is skipped.
+
+        :return: The items
+        :rtype: list[dict]
+        '''
+        items = {}
+
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as file:
+                for item in json.load(file):
+                    items[item['uid']] = item
+
+        self.journal_records = 0
+
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, 'r', encoding='utf-8') as file:
+                for number, line in enumerate(file, start=1):
+                    if not line.strip():
+                        continue
+
+                    try:
+                        record = json.loads(line)
+                        operation = record.pop('op')
+                    except (ValueError, KeyError):
+                        LOGGER.warning('Skipping corrupt journal record in line %d', number)
+                        continue
+
+                    if operation == 'register':
+                        items[record['uid']] = record
+                    elif operation == 'unregister':
+                        items.pop(record['uid'], None)
+
+                    self.journal_records += 1
+
+        return list(items.values())
+
+    def ensure_directory(self):
+        '''
+        Create the directory of the storage, if it's not existing yet.
+        '''
+        directory = os.path.dirname(self.path)
+
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+    def append(self, *records):
+        '''
+        Append records to the journal and flush them to disk.
+
+        :param dict \\*records: The records, each with an ``op`` key
+
+        :return: The journal should be compacted
+        :rtype: bool
+        '''
+        self.ensure_directory()
+
+        created = not os.path.exists(self.journal_path)
+        data    = ''.join(json.dumps(record) + '\n' for record in records).encode('utf-8')
+
+        with open(self.journal_path, 'ab+') as file:
+            # Terminate a truncated record first, so that it doesn't corrupt
+            # the record which is appended now.
+            if file.seek(0, os.SEEK_END):
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b'\n':
+                    data = b'\n' + data
+
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+
+        if created:
+            fsync_directory(os.path.dirname(self.journal_path))
+
+        self.journal_records += len(records)
+
+        return self.journal_records >= self.compact_threshold
+
+    def compact(self, items):
+        '''
+        Write all items atomically to a new snapshot and clear the journal.
+
+        :param iterable items: The items
+        '''
+        LOGGER.debug('Compacting registry storage into %s', self.path)
+
+        self.ensure_directory()
+
+        temp_path = f'{self.path}.tmp'
+
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(list(items), file, indent=4)
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temp_path, self.path)
+        fsync_directory(os.path.dirname(self.path))
+
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+            fsync_directory(os.path.dirname(self.journal_path))
+
+        self.journal_records = 0
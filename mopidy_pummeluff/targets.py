@@ -0,0 +1,132 @@
+'''
+Python module for Mopidy Pummeluff target cache.
+'''
+
+__all__ = (
+    'TargetCache',
+    'TARGETS',
+)
+
+from logging import getLogger
+from queue import Queue
+from threading import Lock
+from time import monotonic, time
+
+LOGGER = getLogger(__name__)
+
+
+class TargetCache:
+    '''
+    Class which caches the pre-resolved track URIs of tag targets (i.e. the
+    URIs of Tracklist tags) for a limited time.
+
+    The targets are resolved in the background by the
+    :py:class:`~mopidy_pummeluff.threads.TargetWarmer` thread, which consumes
+    the URIs scheduled in the :py:attr:`queue`.
+    '''
+
+    def __init__(self, enabled=False, ttl=3600):
+        '''
+        Constructor.
+
+        :param bool enabled: Enable the cache & the scheduling of targets
+        :param int ttl: The time to live of the cache entries in seconds
+        '''
+        self.enabled  = enabled
+        self.ttl      = ttl
+        self.lock     = Lock()
+        self.queue    = Queue()
+        self.entries  = {}
+        self.failures = {}
+        self.warmed   = None
+
+    def get(self, uri):
+        '''
+        Return the pre-resolved track URIs of a target.
+
+        :param str uri: The target URI
+
+        :return: The track URIs or ``None`` if not cached or expired
+        :rtype: list|None
+        '''
+        entry = self.entries.get(uri)
+
+        if entry is None or entry[1] < monotonic():
+            return None
+
+        return entry[0]
+
+    def set(self, uri, uris):
+        '''
+        Store the resolved track URIs of a target.
+
+        :param str uri: The target URI
+        :param list uris: The track URIs
+        '''
+        with self.lock:
+            self.entries[uri] = (uris, monotonic() + self.ttl)
+            self.failures.pop(uri, None)
+
+    def fail(self, uri, message):
+        '''
+        Record a failed resolution of a target.
+
+        :param str uri: The target URI
+        :param str message: The error message
+        '''
+        LOGGER.warning('Could not resolve target "%s": %s', uri, message)
+
+        with self.lock:
+            self.failures[uri] = {
+                'message': message,
+                'timestamp': time(),
+            }
+
+    def invalidate(self, uri=None):
+        '''
+        Invalidate a single target or all targets.
+
+        :param str uri: The target URI (optional)
+        '''
+        with self.lock:
+            if uri is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(uri, None)
+
+    def schedule(self, uris):
+        '''
+        Schedule targets for resolution.
+
+        :param iterable uris: The target URIs (e.g. of
+            :py:attr:`actions.Action.targets`)
+        '''
+        if not self.enabled:
+            return
+
+        for uri in uris:
+            LOGGER.debug('Scheduling target "%s" for warm-up', uri)
+            self.queue.put(uri)
+
+    def as_dict(self):
+        '''
+        Dict representation of the warm-up status.
+
+        :return: The dict version of the status
+        :rtype: dict
+        '''
+        now = monotonic()
+
+        with self.lock:
+            return {
+                'enabled': self.enabled,
+                'ttl': self.ttl,
+                'pending': self.queue.qsize(),
+                'resolved': sum(1 for entry in self.entries.values() if entry[1] >= now),
+                'expired': sum(1 for entry in self.entries.values() if entry[1] < now),
+                'warmed': self.warmed,
+                'failures': dict(self.failures),
+            }
+
+
+TARGETS = TargetCache()
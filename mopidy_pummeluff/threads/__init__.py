@@ -2,5 +2,8 @@
 Threads of Mopidy Pummeluff.
 '''
 
+from .action_dispatcher import *
 from .gpio_handler import *
 from .tag_reader import *
+from .target_warmer import *
+from .tracklist_loader import *
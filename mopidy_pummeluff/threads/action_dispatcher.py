@@ -0,0 +1,144 @@
+'''
+Python module for the dedicated Mopidy Pummeluff threads.
+'''
+
+__all__ = (
+    'ActionDispatcher',
+)
+
+from collections import deque
+from logging import getLogger
+from threading import Condition, Thread
+from time import monotonic
+
+from mopidy_pummeluff.metrics import Histogram
+
+LOGGER = getLogger(__name__)
+
+
+class ActionDispatcher(Thread):
+    '''
+    Thread which executes the dispatched actions one after another, so that
+    the threads dispatching them (e.g. the tag reader) aren't blocked by slow
+    Mopidy core calls.
+
+    The queue is bounded. When it's full, the oldest pending action is
+    dropped. Actions which are flagged with ``coalesce`` replace a pending
+    action of the same class, because only the latest one matters (e.g. when
+    setting the volume multiple times in a row).
+    '''
+    daemon = True
+
+    def __init__(self, core, stop_event, queue_size=8):
+        '''
+        Class constructor.
+
+        :param mopidy.core.Core core: The mopidy core instance
+        :param threading.Event stop_event: The stop event
+        :param int queue_size: The maximum number of pending actions
+        '''
+        super().__init__(name='PummeluffActionDispatcher')
+        self.core       = core
+        self.stop_event = stop_event
+        self.queue_size = queue_size
+        self.pending    = deque()
+        self.condition  = Condition()
+
+        self.dispatched = 0
+        self.coalesced  = 0
+        self.dropped    = 0
+        self.executed   = 0
+        self.failed     = 0
+        self.wait_time  = Histogram()
+        self.run_time   = Histogram()
+
+    def dispatch(self, action):
+        '''
+        Queue an action for execution and return immediately.
+
+        :param actions.Action action: The action instance
+        '''
+        key = action.__class__ if action.coalesce else None
+
+        with self.condition:
+            self.dispatched += 1
+
+            if key is not None:
+                for item in self.pending:
+                    if item[0].__class__ is key:
+                        LOGGER.debug('Coalescing %r with pending %r', action, item[0])
+                        self.pending.remove(item)
+                        self.coalesced += 1
+                        break
+
+            if len(self.pending) >= self.queue_size:
+                dropped = self.pending.popleft()
+                LOGGER.warning('Action queue is full, dropping %r', dropped[0])
+                self.dropped += 1
+
+            self.pending.append((action, monotonic()))
+            self.condition.notify()
+
+    def stop(self):
+        '''
+        Wake up the thread, so that it notices the stop event.
+        '''
+        with self.condition:
+            self.condition.notify()
+
+    def run(self):
+        '''
+        Run the action execution loop.
+        '''
+        while not self.stop_event.is_set():
+            with self.condition:
+                while not self.pending and not self.stop_event.is_set():
+                    self.condition.wait()
+
+                if self.stop_event.is_set():
+                    break
+
+                action, queued = self.pending.popleft()
+
+            self.execute(action, queued)
+
+    def execute(self, action, queued):
+        '''
+        Execute an action and measure its timings.
+
+        :param actions.Action action: The action instance
+        :param float queued: The monotonic timestamp when it was queued
+        '''
+        started = monotonic()
+        self.wait_time.observe(started - queued)
+
+        try:
+            action(self.core)
+            self.executed += 1
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception('Execution of %r failed', action)
+            self.failed += 1
+
+        self.run_time.observe(monotonic() - started)
+
+    def as_dict(self):
+        '''
+        Dict representation of the dispatcher status.
+
+        :return: The dict version of the status
+        :rtype: dict
+        '''
+        with self.condition:
+            depth = len(self.pending)
+
+        return {
+            'depth': depth,
+            'queue_size': self.queue_size,
+            'dispatched': self.dispatched,
+            'coalesced': self.coalesced,
+            'dropped': self.dropped,
+            'executed': self.executed,
+            'failed': self.failed,
+            'wait_time': self.wait_time.as_dict(),
+            'run_time': self.run_time.as_dict(),
+        }
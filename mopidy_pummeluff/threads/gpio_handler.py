@@ -8,11 +8,13 @@ __all__ = (
 
 from logging import getLogger
 from threading import Thread
-from time import time
-
-from RPi import GPIO  # pylint: disable=import-error
+from time import monotonic, time
 
 from mopidy_pummeluff import actions
+from mopidy_pummeluff.bindings import Binding, ButtonDecoder, parse_binding
+from mopidy_pummeluff.debounce import DEBOUNCER
+from mopidy_pummeluff.events import EVENTS
+from mopidy_pummeluff.gpio import EDGES
 from mopidy_pummeluff.sound import play_sound
 
 LOGGER = getLogger(__name__)
@@ -22,72 +24,238 @@ class GPIOHandler(Thread):
     '''
     Thread which handles the GPIO ports, which basically means activating the
     LED when it's started and then reacting to button presses.
+
+    The events of all buttons are read from the single event queue of the GPIO
+    backend (see :py:mod:`mopidy_pummeluff.gpio`), thus they're handled one
+    after another in the order they happened. They're decoded into triggered
+    bindings by a :py:class:`~mopidy_pummeluff.bindings.ButtonDecoder`.
+
+    Triggered bindings are debounced by the ``button`` source of the
+    :py:data:`~mopidy_pummeluff.debounce.DEBOUNCER`. When a hold interval is
+    defined, held buttons which trigger immediately are polled in that
+    interval, so that they can be repeated by the debouncer.
     '''
 
-    def __init__(self, core, config, stop_event):
+    #: The timeout in seconds while waiting for events, after which the stop
+    #: event is checked.
+    timeout = 0.5
+
+    def __init__(self, core, config, dispatcher, stop_event, gpio, hold_interval=None):  # pylint: disable=too-many-arguments
         '''
         Class constructor.
 
         :param mopidy.core.Core core: The mopidy core instance
         :param configparser.ConfigParser config: The config parser instance
+        :param ActionDispatcher dispatcher: The action dispatcher
         :param threading.Event stop_event: The stop event
+        :param mopidy_pummeluff.gpio.GPIOBackend gpio: The GPIO backend
+        :param float hold_interval: The poll interval of held buttons in
+            seconds (``None`` to disable polling)
         '''
-        super().__init__()
+        super().__init__(name='PummeluffGPIOHandler')
 
-        self.core       = core
-        self.config     = config
-        self.stop_event = stop_event
+        self.core          = core
+        self.config        = config
+        self.dispatcher    = dispatcher
+        self.stop_event    = stop_event
+        self.gpio          = gpio
+        self.hold_interval = hold_interval
+        self.held          = set()
 
         self.init_pin_config()
 
     def init_pin_config(self):
         '''
         Initialise the GPIO pin config.
+
+        The buttons are bound to actions by the ``button_<n>`` keys (see
+        :py:func:`~mopidy_pummeluff.bindings.parse_binding`). The legacy
+        ``<action>_pin`` keys (e.g. ``play_pause_pin``) are bound as ``short``
+        bindings, unless the same pin and mode is bound explicitly.
+
+        Pins which need to detect releases (i.e. for ``long`` or ``double``
+        bindings and chords) detect both edges by default.
+
+        The edge and bounce time of each button pin can be overridden by an
+        entry in the ``gpio_pins`` list, in the format ``pin:edge:bouncetime``
+        (e.g. ``29:both:20``), where the edge and bounce time are optional.
+
+        :raises ValueError: When a binding or ``gpio_pins`` entry is invalid
         '''
-        config = self.config['pummeluff']
-        names  = [name for name in config if name.endswith('_pin') and name != 'led_pin']
-        now    = time()
+        config   = self.config['pummeluff']
+        names    = [name for name in config if name.endswith('_pin') and name != 'led_pin']
+        bindings = {}
 
         self.led_pin = config['led_pin']
 
-        self.button_pins = {
-            config[name]: {
-                'action': getattr(actions, name[0:-4].replace('_', ' ').title().replace(' ', '')),
-                'triggered': now,
-            }
-            for name in names
-        }
+        for name in names:
+            if config[name] is None:
+                continue
+
+            action_class = actions.CATALOG.get(name[0:-4].replace('_', ' ').title().replace(' ', ''))
+            pins         = frozenset((config[name],))
+            bindings[(pins, 'short')] = Binding(pins, action_class(uid=name), 'short')
+
+        buttons = [name for name in config if name.startswith('button_') and name[7:].isdigit()]
+
+        for name in sorted(buttons, key=lambda name: int(name[7:])):
+            if config[name]:
+                binding = parse_binding(config[name], uid=name)
+                bindings[(binding.pins, binding.mode)] = binding
+
+        self.decoder = ButtonDecoder(
+            bindings.values(),
+            long_press=config['button_long_press'] / 1000,
+            double_click=config['button_double_click'] / 1000,
+        )
+
+        self.pin_options = {}
+
+        for pin in sorted(self.decoder.pins):
+            edge = 'both' if pin in self.decoder.release_pins else config['gpio_edge']
+            self.pin_options[pin] = (edge, config['gpio_bouncetime'] / 1000)
+
+        for entry in config['gpio_pins'] or ():
+            pin, edge, bouncetime = (entry.split(':') + ['', ''])[:3]
+
+            try:
+                pin = int(pin)
+                default_edge, default_bouncetime = self.pin_options[pin]
+                edge       = edge.strip() or default_edge
+                bouncetime = int(bouncetime) / 1000 if bouncetime.strip() else default_bouncetime
+            except (KeyError, ValueError) as ex:
+                raise ValueError(f'Invalid GPIO pin option "{entry}"') from ex
+
+            if edge not in EDGES:
+                raise ValueError(f'Invalid edge "{edge}" for GPIO pin {pin}')
+
+            self.pin_options[pin] = (edge, bouncetime)
 
-    # pylint: disable=no-member
     def run(self):
         '''
         Run the thread.
         '''
-        GPIO.setmode(GPIO.BOARD)
+        gpio = self.gpio
 
-        for pin in self.button_pins:
-            LOGGER.debug('Setup pin %s as button pin', pin)
-            GPIO.setup(pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-            GPIO.add_event_detect(pin, GPIO.RISING, callback=lambda pin: self.button_push(pin))  # pylint: disable=unnecessary-lambda
+        for pin, (edge, bouncetime) in self.pin_options.items():
+            LOGGER.debug('Setup pin %s as button pin (%s edge, %ss bounce time)', pin, edge, bouncetime)
+            gpio.setup_input(pin, edge, bouncetime)
 
         LOGGER.debug('Setup pin %s as LED pin', self.led_pin)
-        GPIO.setup(self.led_pin, GPIO.OUT)
-        GPIO.output(self.led_pin, GPIO.HIGH)
+        gpio.setup_output(self.led_pin, True)
+
+        while not self.stop_event.is_set():
+            timeout  = min(self.timeout, self.hold_interval) if self.held else self.timeout
+            deadline = self.decoder.deadline
+
+            if deadline is not None:
+                timeout = max(0, min(timeout, deadline - monotonic()))
+
+            event = gpio.wait_event(timeout)
+
+            if event is not None:
+                self.handle_event(event)
 
-        self.stop_event.wait()
-        GPIO.cleanup()  # pylint: disable=no-member
+            self.poll()
 
-    def button_push(self, pin):
+        gpio.cleanup()
+
+    def handle_event(self, event):
+        '''
+        Handle an event of a button pin.
+
+        Pins which only detect rising edges only report releases, thus they
+        are decoded as a push followed by a release.
+
+        :param mopidy_pummeluff.gpio.PinEvent event: The pin event
         '''
-        Callback method when a button is pushed.
+        pin, pressed, timestamp = event
+        decoder = self.decoder
+
+        if pin not in self.pin_options:
+            return
+
+        if self.pin_options[pin][0] == 'rising':
+            triggered = decoder.press(pin, timestamp) + decoder.release(pin, timestamp)
+        elif pressed:
+            triggered = decoder.press(pin, timestamp)
+            if self.hold_interval and pin in decoder.immediate:
+                self.held.add(pin)
+        else:
+            self.held.discard(pin)
+            triggered = decoder.release(pin, timestamp)
 
-        :param int pin: Pin number
+        for binding in triggered:
+            self.trigger(binding, timestamp)
+
+    def poll(self):
+        '''
+        Poll the held buttons, release the buttons which were released
+        without a detected edge and trigger the due bindings of the decoder.
         '''
-        now    = time()
-        before = self.button_pins[pin]['triggered']
-
-        if (GPIO.input(pin) == GPIO.LOW) and (now - before > 0.25):
-            LOGGER.debug('Button at pin %s was pushed', pin)
-            play_sound('success.wav')
-            self.button_pins[pin]['action'].execute(self.core)
-            self.button_pins[pin]['timestamp'] = now
+        gpio    = self.gpio
+        decoder = self.decoder
+        now     = monotonic()
+
+        for pin in tuple(self.held):
+            if gpio.is_pressed(pin):
+                self.trigger(decoder.immediate[pin], now)
+            else:
+                self.held.discard(pin)
+
+        for pin in tuple(decoder.pressed):
+            if self.pin_options[pin][0] != 'both' and not gpio.is_pressed(pin):
+                for binding in decoder.release(pin, now):
+                    self.trigger(binding, now)
+
+        for binding in decoder.poll(now):
+            self.trigger(binding, now)
+
+    def trigger(self, binding, timestamp=None):
+        '''
+        Dispatch the action of a triggered binding, unless it's suppressed by
+        the debouncer.
+
+        :param mopidy_pummeluff.bindings.Binding binding: The binding
+        :param float timestamp: The monotonic timestamp of the event
+        '''
+        if not DEBOUNCER.fire('button', (binding.pins, binding.mode), timestamp):
+            return
+
+        pins   = sorted(binding.pins)
+        action = binding.action
+
+        LOGGER.debug('Button at pin %s was pushed (%s)', '+'.join(map(str, pins)), binding.mode)
+        play_sound('success.wav')
+        self.dispatcher.dispatch(action)
+
+        EVENTS.publish('button', {
+            'pins': pins,
+            'mode': binding.mode,
+            'action': action.__class__.__name__,
+            'pushed': time(),
+        })
+
+    def as_dict(self):
+        '''
+        Dict representation of the GPIO status.
+
+        :return: The dict version of the status
+        :rtype: dict
+        '''
+        return {
+            **self.gpio.as_dict(),
+            'bindings': [
+                {
+                    'pins': sorted(binding.pins),
+                    'mode': binding.mode,
+                    **binding.action.as_dict(),
+                }
+                for binding in self.decoder.table.values()
+            ],
+            'pins': {
+                pin: {'edge': edge, 'bouncetime': bouncetime}
+                for pin, (edge, bouncetime) in self.pin_options.items()
+            },
+            'held': sorted(self.held),
+        }
@@ -8,111 +8,136 @@ __all__ = (
 
 from logging import getLogger
 from threading import Thread
-from time import time
-
-from pirc522 import RFID  # pylint: disable=import-error
-from RPi import GPIO  # pylint: disable=import-error
+from time import monotonic, time
 
+from mopidy_pummeluff import registry
 from mopidy_pummeluff.actions.base import Action
-from mopidy_pummeluff.registry import REGISTRY
+from mopidy_pummeluff.debounce import DEBOUNCER
+from mopidy_pummeluff.events import EVENTS
+from mopidy_pummeluff.history import HISTORY
+from mopidy_pummeluff.metrics import Histogram
+from mopidy_pummeluff.readers import ReadError
 from mopidy_pummeluff.sound import play_sound
+from mopidy_pummeluff.uid import format_uid
 
 LOGGER = getLogger(__name__)
 
 
-class ReadError(Exception):
-    '''
-    Exception which is thrown when an RFID read error occurs.
-    '''
-
-
 class TagReader(Thread):
     '''
-    Thread which reads RFID tags from the RFID reader.
+    Thread which reads RFID tags from a reader backend (see
+    :py:mod:`mopidy_pummeluff.readers`).
 
-    Because the RFID reader algorithm is reacting to an IRQ (interrupt), it is
-    blocking as long as no tag is touched, even when Mopidy is exiting. Thus,
-    we're running the thread as daemon thread, which means it's exiting at the
-    same moment as the main thread (aka Mopidy core) is exiting.
+    Because some reader backends are blocking as long as no tag is touched,
+    even when Mopidy is exiting, we're running the thread as daemon thread,
+    which means it's exiting at the same moment as the main thread (aka
+    Mopidy core) is exiting.
     '''
     daemon = True
     latest = None
 
-    def __init__(self, core, stop_event):
+    def __init__(self, core, dispatcher, stop_event, reader, backoff=0.05):  # pylint: disable=too-many-arguments
         '''
         Class constructor.
 
         :param mopidy.core.Core core: The mopidy core instance
+        :param ActionDispatcher dispatcher: The action dispatcher
         :param threading.Event stop_event: The stop event
+        :param mopidy_pummeluff.readers.Reader reader: The reader backend
+        :param float backoff: The initial backoff in seconds after a failed
+            read, which is doubled on every consecutive failure
         '''
         super().__init__()
-        self.core       = core
-        self.stop_event = stop_event
-        self.rfid       = RFID()
+        self.core        = core
+        self.dispatcher  = dispatcher
+        self.stop_event  = stop_event
+        self.reader      = reader
+        self.backoff     = backoff
+        self.max_backoff = 1
+        self.timings     = {**reader.timings, 'dispatch': Histogram()}
+        self.counters    = {'reads': 0, 'read_errors': 0}
 
     def run(self):
         '''
         Run RFID reading loop.
+
+        Repeated reads of the same tag are suppressed by the ``tag`` source
+        of the :py:data:`~mopidy_pummeluff.debounce.DEBOUNCER`.
         '''
-        rfid      = self.rfid
-        prev_time = time()
-        prev_uid  = ''
+        reader   = self.reader
+        failures = 0
 
         while not self.stop_event.is_set():
-            rfid.wait_for_tag()
+            started = monotonic()
 
-            try:
-                uid = self.read_uid()
-            except ReadError:
+            if not reader.wait_for_tag(self.stop_event):
                 continue
 
-            now = time()
-            if now - prev_time > 1 or uid != prev_uid:
-                LOGGER.info('Tag %s read', uid)
-                self.handle_uid(uid)
-
-            prev_time = now
-            prev_uid  = uid
-
-        GPIO.cleanup()  # pylint: disable=no-member
-
-    def read_uid(self):
-        '''
-        Return the UID from the tag.
+            detected = monotonic()
+            self.timings['wait'].observe(detected - started)
 
-        :return: The hex UID
-        :rtype: string
-
-        :raises ReadError: When RFID tag couldn't be read
-        '''
-        rfid = self.rfid
+            try:
+                uid = reader.read_uid()
+            except ReadError as ex:
+                HISTORY.append(None, None, time(), monotonic() - detected, 'read_error')
+                self.counters['read_errors'] += 1
+                failures += 1
+                backoff   = min(self.backoff * 2 ** (failures - 1), self.max_backoff)
+                LOGGER.debug('%s, backing off for %.3fs', ex, backoff)
+                self.stop_event.wait(backoff)
+                continue
 
-        error, data = rfid.request()  # pylint: disable=unused-variable
-        if error:
-            raise ReadError('Could not read tag')
+            latency  = monotonic() - detected
+            failures = 0
+            self.counters['reads'] += 1
 
-        error, uid_chunks = rfid.anticoll()
-        if error:
-            raise ReadError('Could not read UID')
+            if DEBOUNCER.fire('tag', uid):
+                LOGGER.info('Tag %s read', format_uid(uid))
+                dispatched = monotonic()
+                self.handle_uid(uid, latency)
+                self.timings['dispatch'].observe(monotonic() - dispatched)
+            else:
+                HISTORY.append(format_uid(uid), None, time(), latency, 'duplicate')
 
-        return ''.join([f'{chunk:X}' for chunk in uid_chunks[0:4]])
+        reader.close()
 
-    def handle_uid(self, uid):
+    def handle_uid(self, uid, latency=None):
         '''
         Handle the scanned tag / retreived UID.
 
-        :param str uid: The UID
+        :param bytes uid: The UID bytes
+        :param float latency: The read latency in seconds
         '''
         try:
-            action = REGISTRY[str(uid)]
+            action  = registry.REGISTRY.lookup(uid)
+            outcome = 'dispatched'
             LOGGER.info('Triggering action of registered tag')
             play_sound('success.wav')
-            action(self.core)
+            self.dispatcher.dispatch(action)
 
         except KeyError:
             LOGGER.info('Tag is not registered, thus doing nothing')
             play_sound('fail.wav')
-            action = Action(uid=uid)
+            action  = Action(uid=format_uid(uid))
+            outcome = 'unregistered'
 
         action.scanned   = time()
         TagReader.latest = action
+
+        HISTORY.append(action.uid, action.__class__.__name__, action.scanned, latency, outcome)
+
+        EVENTS.publish('scan', action.as_dict(include_scanned=True))
+
+    def as_dict(self):
+        '''
+        Dict representation of the reader status.
+
+        :return: The dict version of the status
+        :rtype: dict
+        '''
+        return {
+            **self.reader.as_dict(),
+            'backoff': self.backoff,
+            **self.counters,
+            'timings': {stage: histogram.as_dict() for stage, histogram in self.timings.items()},
+        }
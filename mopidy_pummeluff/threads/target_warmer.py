@@ -0,0 +1,112 @@
+'''
+Python module for the dedicated Mopidy Pummeluff threads.
+'''
+
+__all__ = (
+    'TargetWarmer',
+)
+
+from logging import getLogger
+from queue import Empty
+from threading import Thread
+from time import monotonic, time
+
+from mopidy_pummeluff import registry
+from mopidy_pummeluff.playlists import PLAYLISTS
+from mopidy_pummeluff.targets import TARGETS
+
+LOGGER = getLogger(__name__)
+
+
+class TargetWarmer(Thread):
+    '''
+    Thread which resolves the targets of all registered tags into track URIs
+    in the background, so that a scan doesn't have to wait for the backends.
+
+    All registered targets are resolved when the thread is started and then
+    again before their cache entries expire. Targets of newly registered tags
+    are resolved as soon as they're scheduled.
+    '''
+    daemon = True
+
+    def __init__(self, core, stop_event, batch_size=20):
+        '''
+        Class constructor.
+
+        :param mopidy.core.Core core: The mopidy core instance
+        :param threading.Event stop_event: The stop event
+        :param int batch_size: The maximum number of URIs per library lookup
+        '''
+        super().__init__(name='PummeluffTargetWarmer')
+        self.core       = core
+        self.stop_event = stop_event
+        self.batch_size = batch_size
+
+    def schedule_all(self):
+        '''
+        Schedule the targets of all registered tags.
+        '''
+        TARGETS.schedule(registry.REGISTRY.all_targets())
+
+    def run(self):
+        '''
+        Run the warm-up loop.
+        '''
+        refresh = 0
+
+        while not self.stop_event.is_set():
+            now = monotonic()
+
+            if now >= refresh:
+                self.schedule_all()
+                refresh = now + TARGETS.ttl * 0.9
+
+            try:
+                uris = [TARGETS.queue.get(timeout=min(refresh - now, 1))]
+            except Empty:
+                continue
+
+            while len(uris) < self.batch_size:
+                try:
+                    uris.append(TARGETS.queue.get_nowait())
+                except Empty:
+                    break
+
+            try:
+                self.resolve(dict.fromkeys(uris))
+            except Exception as ex:  # pylint: disable=broad-except
+                LOGGER.exception('Warm-up of targets failed')
+                for uri in uris:
+                    TARGETS.fail(uri, str(ex))
+
+            TARGETS.warmed = time()
+
+    def resolve(self, uris):
+        '''
+        Resolve targets into track URIs and store them in the target cache.
+
+        Playlists are resolved via the playlist index, all other URIs are
+        looked up in a single library lookup.
+
+        :param iterable uris: The target URIs
+        '''
+        lookups = []
+
+        for uri in uris:
+            if PLAYLISTS.is_playlist(self.core, uri):
+                TARGETS.set(uri, PLAYLISTS.get_items(self.core, uri))
+            else:
+                lookups.append(uri)
+
+        if not lookups:
+            return
+
+        LOGGER.debug('Looking up %d targets', len(lookups))
+        results = self.core.library.lookup(uris=lookups).get()
+
+        for uri in lookups:
+            tracks = results.get(uri)
+            if tracks:
+                TARGETS.set(uri, [track.uri for track in tracks])
+            else:
+                TARGETS.fail(uri, 'No tracks found')
@@ -0,0 +1,248 @@
+'''
+Python module for the dedicated Mopidy Pummeluff threads.
+'''
+
+__all__ = (
+    'TracklistLoader',
+)
+
+from collections import defaultdict, deque
+from logging import getLogger
+from threading import Event, Lock, Thread
+
+from mopidy_pummeluff.events import EVENTS
+from mopidy_pummeluff.resume import LOADED
+
+LOGGER = getLogger(__name__)
+
+
+class TracklistLoader(Thread):
+    '''
+    Thread which loads the remaining tracks of a progressively loaded
+    tracklist in batches, while the first tracks are already playing.
+
+    The tracks after the first tracks are appended, the tracks before them
+    are inserted at the beginning, so that the final tracklist has the same
+    order as if it was loaded at once. The loading is aborted when the
+    tracklist is changed by someone else, and cancelled when a new tracklist
+    is loaded.
+
+    A URI can resolve to no track (e.g. an unavailable track) or to several
+    tracks (e.g. an album), thus the added tracks are mapped back to their
+    URIs (see :py:meth:`add`), instead of relying on their position.
+    '''
+    daemon = True
+
+    #: Load tracklists progressively.
+    enabled = False
+
+    #: The number of tracks which are loaded before the playback starts.
+    head = 1
+
+    #: The number of tracks which are loaded per batch.
+    batch_size = 50
+
+    current = None
+    lock    = Lock()
+
+    def __init__(self, core, uri, uris, tlids, version, head):  # pylint: disable=too-many-arguments
+        '''
+        Class constructor.
+
+        :param mopidy.core.Core core: The mopidy core instance
+        :param str uri: The URI of the tag's parameter
+        :param list[str] uris: All track URIs
+        :param list[tuple] tlids: The tracklist IDs per URI, which are
+            ``None`` for the URIs which aren't loaded yet
+        :param int version: The tracklist version after loading the first
+            tracks
+        :param range head: The indexes of the URIs which are loaded already
+        '''
+        super().__init__(name='PummeluffTracklistLoader')
+        self.core      = core
+        self.uri       = uri
+        self.uris      = uris
+        self.tlids     = tlids
+        self.version   = version
+        self.head      = head
+        self.cancelled = Event()
+        self.loaded    = len(head)
+        self.state     = 'loading'
+
+    @classmethod
+    def start_loading(cls, *args, **kwargs):
+        '''
+        Cancel the current loader and start a new one.
+
+        :param list \\*args: The positional arguments for the loader
+        :param dict \\**kwargs: The keyword arguments for the loader
+
+        :return: The loader
+        :rtype: TracklistLoader
+        '''
+        loader = cls(*args, **kwargs)
+
+        with cls.lock:
+            cls.cancel_current()
+            cls.current = loader
+
+        loader.start()
+        return loader
+
+    @classmethod
+    def cancel_current(cls):
+        '''
+        Cancel the current loader, if there's one, and wait until its current
+        batch is added, so that it can't interfere with a new tracklist.
+        '''
+        current = cls.current
+
+        if current is not None and current.is_alive():
+            current.cancel()
+            current.join()
+
+    @classmethod
+    def wait_current(cls):
+        '''
+        Wait until the current loader, if there's one, is finished.
+        '''
+        current = cls.current
+
+        if current is not None and current.is_alive():
+            current.join()
+
+    @classmethod
+    def status(cls):
+        '''
+        Dict representation of the current loader status.
+
+        :return: The dict version of the status
+        :rtype: dict
+        '''
+        current = cls.current
+        return current.as_dict() if current is not None else {'state': 'idle'}
+
+    @staticmethod
+    def add(core, uris, at_position=None):
+        '''
+        Add the tracks of URIs to the tracklist.
+
+        The URIs are looked up first, so that the added tracks can be mapped
+        back to their URIs, even when a URI resolves to no or several tracks.
+
+        :param mopidy.core.Core core: The mopidy core instance
+        :param list[str] uris: The URIs
+        :param int at_position: The position to insert the tracks, or ``None``
+            to append them
+
+        :return: The tracklist IDs per URI, and the number of added tracks
+        :rtype: tuple
+        '''
+        results = core.library.lookup(uris=uris).get()
+        tracks  = [results.get(uri) or () for uri in uris]
+
+        if not any(tracks):
+            return [()] * len(uris), 0
+
+        track_uris = [track.uri for uri_tracks in tracks for track in uri_tracks]
+        tl_tracks  = core.tracklist.add(uris=track_uris, at_position=at_position).get()
+        added      = defaultdict(deque)
+
+        for tl_track in tl_tracks:
+            added[tl_track.track.uri].append(tl_track.tlid)
+
+        tlids = [
+            tuple(added[track.uri].popleft() for track in uri_tracks if added[track.uri])
+            for uri_tracks in tracks
+        ]
+
+        return tlids, len(tl_tracks)
+
+    def cancel(self):
+        '''
+        Cancel the loading.
+        '''
+        self.cancelled.set()
+
+    def batches(self):
+        '''
+        Return the remaining batches.
+
+        The batches after the loaded tracks are appended, the batches before
+        them are inserted at the beginning.
+
+        :return: The batches as tuples of the start index, the URIs and a flag
+            if they're inserted at the beginning
+        :rtype: list[tuple]
+        '''
+        size = self.batch_size
+
+        return [
+            (index, self.uris[index:min(index + size, limit)], prepend)
+            for first, limit, prepend in ((self.head.stop, len(self.uris), False), (0, self.head.start, True))
+            for index in range(first, limit, size)
+        ]
+
+    def run(self):
+        '''
+        Load the remaining tracks in batches.
+        '''
+        try:
+            self.load()
+        except Exception as ex:  # pylint: disable=broad-except
+            self.state = 'failed'
+            LOGGER.error('Loading of tracklist "%s" failed: %s', self.uri, ex)
+            EVENTS.publish('tracklist', self.as_dict())
+
+    def load(self):
+        '''
+        Load the remaining tracks in batches, until all tracks are loaded, the
+        loading is cancelled or the tracklist is changed by someone else.
+        '''
+        tracklist = self.core.tracklist
+        inserted  = 0
+
+        for index, uris, prepend in self.batches():
+            if self.cancelled.is_set():
+                self.state = 'cancelled'
+                LOGGER.debug('Loading of tracklist "%s" cancelled', self.uri)
+                return
+
+            if tracklist.get_version().get() != self.version:
+                self.state = 'aborted'
+                LOGGER.warning('Tracklist changed while loading "%s", aborting', self.uri)
+                return
+
+            tlids, added = self.add(self.core, uris, at_position=inserted if prepend else None)
+            self.tlids[index:index + len(uris)] = tlids
+
+            # Mopidy increases the version once per added batch, thus any
+            # other change of the tracklist is detected by the next batch.
+            if added:
+                self.version += 1
+
+            if prepend:
+                inserted += added
+
+            self.loaded += len(uris)
+
+            LOADED.update(self.tlids, self.version)
+            EVENTS.publish('tracklist', self.as_dict())
+
+        self.state = 'loaded'
+        LOGGER.info('Loaded %d tracks of tracklist "%s"', self.loaded, self.uri)
+        EVENTS.publish('tracklist', self.as_dict())
+
+    def as_dict(self):
+        '''
+        Dict representation of the loader status.
+
+        :return: The dict version of the status
+        :rtype: dict
+        '''
+        return {
+            'state': self.state,
+            'uri': self.uri,
+            'loaded': self.loaded,
+            'total': len(self.uris),
+        }
@@ -0,0 +1,107 @@
+'''
+Python module for Mopidy Pummeluff tag UIDs.
+
+UIDs are handled as :py:class:`bytes` internally. Their canonical string
+representation is the full-length, zero-padded, uppercase hex string (e.g.
+``04A2B3C4D5E680`` for a 7-byte NTAG UID).
+'''
+
+__all__ = (
+    'CASCADE_TAG',
+    'MIN_UID_LENGTH',
+    'parse_uid',
+    'format_uid',
+    'legacy_uid',
+    'is_canonical_uid',
+)
+
+
+#: First byte of a cascade level, when the UID continues on the next level.
+CASCADE_TAG = 0x88
+
+#: The minimum length of a UID in bytes.
+MIN_UID_LENGTH = 4
+
+SEPARATORS = str.maketrans('', '', ' :-')
+
+
+def parse_uid(uid):
+    '''
+    Parse a UID into its bytes.
+
+    Hex strings are accepted in upper- or lowercase, optionally separated by
+    spaces, colons or dashes (e.g. ``04:a2:b3:c4``).
+
+    :param uid: The UID
+    :type uid: str or bytes
+
+    :return: The UID bytes
+    :rtype: bytes
+
+    :raises ValueError: When the UID is invalid
+    '''
+    if isinstance(uid, (bytes, bytearray)):
+        data = bytes(uid)
+    else:
+        value = str(uid).strip().translate(SEPARATORS)
+
+        try:
+            if len(value) % 2 or not value.isascii() or not value.isalnum():
+                raise ValueError()
+            data = bytes.fromhex(value)
+        except ValueError as ex:
+            raise ValueError(f'UID {uid} is not a hex string') from ex
+
+    if len(data) < MIN_UID_LENGTH:
+        raise ValueError(f'UID {uid} is shorter than {MIN_UID_LENGTH} bytes')
+
+    return data
+
+
+def format_uid(data):
+    '''
+    Format UID bytes as canonical hex string.
+
+    :param bytes data: The UID bytes
+
+    :return: The canonical UID
+    :rtype: str
+    '''
+    return data.hex().upper()
+
+
+def legacy_uid(data):
+    '''
+    Format UID bytes the way earlier versions did, which only used the first
+    four bytes of the first cascade level, and didn't zero-pad them.
+
+    This is lossy and ambiguous (e.g. ``01 23`` and ``12 03`` both resulted
+    in ``123``), thus it's only used to migrate registered tags.
+
+    :param bytes data: The UID bytes
+
+    :return: The legacy UID
+    :rtype: str
+    '''
+    if len(data) > 4:
+        data = bytes((CASCADE_TAG,)) + data[:3]
+
+    return ''.join(f'{chunk:X}' for chunk in data[:4])
+
+
+def is_canonical_uid(uid):
+    '''
+    Check if a UID string is in its canonical representation.
+
+    Legacy UIDs which are in canonical representation are identical to
+    their canonical UID, because all their bytes had two hex digits.
+
+    :param str uid: The UID
+
+    :return: UID is canonical
+    :rtype: bool
+    '''
+    try:
+        return format_uid(parse_uid(uid)) == uid
+    except ValueError:
+        return False
@@ -8,15 +8,30 @@ __all__ = (
     'RegisterHandler',
     'UnregisterHandler',
     'ActionsHandler',
+    'StatusHandler',
+    'ImportHandler',
+    'ExportHandler',
+    'EventsHandler',
+    'HistoryHandler',
 )
 
+from asyncio import CancelledError
+from asyncio import TimeoutError as AsyncTimeoutError
+from asyncio import get_running_loop, wait_for
 from json import dumps
 from logging import getLogger
+from math import isfinite
 
+from tornado.ioloop import IOLoop
+from tornado.iostream import StreamClosedError
+from tornado.queues import Queue, QueueFull
 from tornado.web import RequestHandler
 
-from mopidy_pummeluff.actions import ACTIONS
-from mopidy_pummeluff.registry import REGISTRY
+from mopidy_pummeluff.actions import CATALOG
+from mopidy_pummeluff.events import EVENTS
+from mopidy_pummeluff.history import HISTORY
+from mopidy_pummeluff.registry import REGISTRY, TagImportError
+from mopidy_pummeluff.status import STATUS
 from mopidy_pummeluff.threads import TagReader
 
 LOGGER = getLogger(__name__)
@@ -25,15 +40,96 @@ LOGGER = getLogger(__name__)
 class LatestHandler(RequestHandler):  # pylint: disable=too-few-public-methods,abstract-method
     '''
     Request handler which returns the latest scanned tag.
+
+    When the ``since`` argument is set to the scanned timestamp of a tag, the
+    request is held open (long-polling) until a newer tag is scanned or the
+    ``timeout`` (in seconds) is reached.
     '''
 
-    def get(self, *args, **kwargs):  # pylint: disable=unused-argument
+    max_timeout = 60
+
+    def initialize(self):
+        '''
+        Initialise the handler.
+        '''
+        self.waiter = None  # pylint: disable=attribute-defined-outside-init
+
+    def on_connection_close(self):
+        '''
+        Stop waiting for a newer tag when the client has disconnected.
+        '''
+        if self.waiter is not None and not self.waiter.done():
+            self.waiter.cancel()
+
+    async def wait_for_tag(self, since, timeout):
+        '''
+        Wait until a tag newer than ``since`` is scanned.
+
+        The event bus notifies the IOLoop of the handler from the tag reader
+        thread.
+
+        :param float since: The scanned timestamp of the known tag
+        :param float timeout: The timeout in seconds
+
+        :return: The client is still connected
+        :rtype: bool
+        '''
+        loop        = IOLoop.current()
+        self.waiter = get_running_loop().create_future()  # pylint: disable=attribute-defined-outside-init
+
+        def resolve(waiter):
+            if not waiter.done():
+                waiter.set_result(None)
+
+        def notify(event):
+            if event['type'] == 'scan' and event['data']['scanned'] > since:
+                loop.add_callback(resolve, self.waiter)
+
+        EVENTS.subscribe(notify)
+
+        try:
+            tag = TagReader.latest
+            if tag is None or tag.scanned <= since:
+                await wait_for(self.waiter, timeout)
+        except AsyncTimeoutError:
+            pass
+        except CancelledError:
+            return False
+        finally:
+            EVENTS.unsubscribe(notify)
+
+        return True
+
+    async def get(self, *args, **kwargs):  # pylint: disable=unused-argument
         '''
         Handle GET request.
 
         :param list \\*args: The positional arguments
         :param dict \\**kwargs: The keyword arguments
         '''
+        since = self.get_argument('since', None)
+
+        if since is not None:
+            try:
+                since   = float(since)
+                timeout = float(self.get_argument('timeout', 30))
+
+                if not isfinite(since) or not isfinite(timeout):
+                    raise ValueError()
+
+                timeout = min(timeout, self.max_timeout)
+            except ValueError:
+                self.set_status(400)
+                self.set_header('Content-type', 'application/json')
+                self.write(dumps({
+                    'success': False,
+                    'message': 'Since and timeout have to be numbers',
+                }))
+                return
+
+            if not await self.wait_for_tag(since, timeout):
+                return
+
         tag = TagReader.latest
 
         LOGGER.debug('Returning latest tag %s', tag)
@@ -58,9 +154,24 @@ class LatestHandler(RequestHandler):  # pylint: disable=too-few-public-methods,a
 
 class RegistryHandler(RequestHandler):  # pylint: disable=too-few-public-methods,abstract-method
     '''
-    Request handler which returns all registered tags.
+    Request handler which returns the registered tags.
+
+    The tags can be filtered by ``action`` and ``alias`` prefix, and paginated
+    via ``offset`` and ``limit``. The response carries an entity tag, so that
+    unchanged registries can be answered with ``304 Not Modified``.
     '''
 
+    cache = (None, None)
+
+    def compute_etag(self):
+        '''
+        Return the entity tag of the current registry generation.
+
+        :return: The entity tag
+        :rtype: str
+        '''
+        return REGISTRY.etag
+
     def get(self, *args, **kwargs):  # pylint: disable=unused-argument
         '''
         Handle GET request.
@@ -68,19 +179,72 @@ class RegistryHandler(RequestHandler):  # pylint: disable=too-few-public-methods
         :param list \\*args: The positional arguments
         :param dict \\**kwargs: The keyword arguments
         '''
-        tags_list = []
+        etag = REGISTRY.etag
 
-        for tag in REGISTRY.values():
-            tags_list.append(tag.as_dict())
+        self.set_etag_header()
+        self.set_header('Content-type', 'application/json')
 
-        data = {
+        if self.check_etag_header():
+            self.set_status(304)
+            return
+
+        action = self.get_argument('action', None)
+        alias  = self.get_argument('alias', None)
+
+        try:
+            offset = int(self.get_argument('offset', 0))
+            limit  = self.get_argument('limit', None)
+            limit  = int(limit) if limit is not None else None
+            assert offset >= 0 and (limit is None or limit >= 0)
+        except (ValueError, AssertionError):
+            self.set_status(400)
+            self.write(dumps({
+                'success': False,
+                'message': 'Offset and limit have to be positive numbers',
+            }))
+            return
+
+        if not any((action, alias, offset, limit is not None)):
+            cached_etag, response = RegistryHandler.cache
+            if cached_etag != etag:
+                response = self.serialize(REGISTRY.as_list())
+                RegistryHandler.cache = (etag, response)
+            self.write(response)
+            return
+
+        tags = REGISTRY.as_list()
+
+        if action:
+            tags = [tag for tag in tags if tag['action'] == action]
+
+        if alias:
+            alias = alias.casefold()
+            tags  = [tag for tag in tags if tag['alias'].casefold().startswith(alias)]
+
+        end = None if limit is None else offset + limit
+        self.write(self.serialize(tags[offset:end], total=len(tags), offset=offset, limit=limit))
+
+    @staticmethod
+    def serialize(tags, total=None, offset=0, limit=None):
+        '''
+        Serialize the tags into the JSON response.
+
+        :param list tags: The tags
+        :param int total: The total number of matching tags
+        :param int offset: The offset
+        :param int limit: The limit
+
+        :return: The JSON response
+        :rtype: str
+        '''
+        return dumps({
             'success': True,
             'message': 'Registry successfully read',
-            'tags': tags_list
-        }
-
-        self.set_header('Content-type', 'application/json')
-        self.write(dumps(data))
+            'total': len(tags) if total is None else total,
+            'offset': offset,
+            'limit': limit,
+            'tags': tags,
+        })
 
 
 class RegisterHandler(RequestHandler):  # pylint: disable=too-few-public-methods,abstract-method
@@ -185,8 +349,248 @@ class ActionsHandler(RequestHandler):  # pylint: disable=too-few-public-methods,
         data = {
             'success': True,
             'message': 'Actions successfully retreived',
-            'actions': ACTIONS
+            'actions': CATALOG.as_dict()
+        }
+
+        self.set_header('Content-type', 'application/json')
+        self.write(dumps(data))
+
+
+class StatusHandler(RequestHandler):  # pylint: disable=too-few-public-methods,abstract-method
+    '''
+    Request handler which returns the status of the subsystems.
+    '''
+
+    def get(self, *args, **kwargs):  # pylint: disable=unused-argument
+        '''
+        Handle GET request.
+
+        :param list \\*args: The positional arguments
+        :param dict \\**kwargs: The keyword arguments
+        '''
+        data = {
+            'success': True,
+            'message': 'Status successfully retreived',
+            'status': STATUS.as_dict(),
         }
 
         self.set_header('Content-type', 'application/json')
         self.write(dumps(data))
+
+
+class ImportHandler(RequestHandler):  # pylint: disable=too-few-public-methods,abstract-method
+    '''
+    Request handler which imports multiple RFID tags at once into the
+    registry.
+    '''
+
+    def post(self, *args, **kwargs):  # pylint: disable=unused-argument
+        '''
+        Handle POST request.
+
+        The request body is the JSON or CSV document. The format is either
+        defined via the ``format`` argument or detected by the content type.
+
+        :param list \\*args: The positional arguments
+        :param dict \\**kwargs: The keyword arguments
+        '''
+        content_type = self.request.headers.get('Content-Type', '')
+        data_format  = self.get_argument('format', 'csv' if 'csv' in content_type else 'json')
+
+        try:
+            tags = REGISTRY.import_tags(
+                data=self.request.body.decode('utf-8'),
+                data_format=data_format,
+            )
+
+            data = {
+                'success': True,
+                'message': f'{len(tags)} tags successfully imported',
+                'imported': len(tags),
+            }
+
+        except (UnicodeDecodeError, TagImportError) as ex:
+            self.set_status(400)
+            data = {
+                'success': False,
+                'message': str(ex),
+                'errors': getattr(ex, 'errors', []),
+            }
+
+        self.set_header('Content-type', 'application/json')
+        self.write(dumps(data))
+
+    def put(self, *args, **kwargs):  # pylint: disable=unused-argument
+        '''
+        Handle PUT request.
+
+        :param list \\*args: The positional arguments
+        :param dict \\**kwargs: The keyword arguments
+        '''
+        self.post()
+
+
+class ExportHandler(RequestHandler):  # pylint: disable=too-few-public-methods,abstract-method
+    '''
+    Request handler which streams all registered tags as JSON or CSV document.
+    '''
+
+    content_types = {
+        'json': 'application/json',
+        'csv': 'text/csv',
+    }
+
+    async def get(self, *args, **kwargs):  # pylint: disable=unused-argument
+        '''
+        Handle GET request.
+
+        :param list \\*args: The positional arguments
+        :param dict \\**kwargs: The keyword arguments
+        '''
+        data_format = self.get_argument('format', 'json')
+
+        if data_format not in self.content_types:
+            self.set_status(400)
+            self.set_header('Content-type', 'application/json')
+            self.write(dumps({
+                'success': False,
+                'message': f'Unsupported format {data_format}',
+            }))
+            return
+
+        self.set_header('Content-type', self.content_types[data_format])
+        self.set_header('Content-Disposition', f'attachment; filename="tags.{data_format}"')
+
+        for chunk in REGISTRY.export_tags(data_format=data_format):
+            self.write(chunk)
+            await self.flush()
+
+
+class EventsHandler(RequestHandler):  # pylint: disable=too-few-public-methods,abstract-method
+    '''
+    Request handler which streams the events (e.g. scanned tags or pushed
+    buttons) as server-sent events.
+    '''
+
+    queue_size = 32
+
+    def initialize(self):
+        '''
+        Initialise the handler.
+        '''
+        self.queue = Queue(maxsize=self.queue_size)  # pylint: disable=attribute-defined-outside-init
+        self.loop  = IOLoop.current()  # pylint: disable=attribute-defined-outside-init
+
+    def enqueue(self, event):
+        '''
+        Hand an event over to the IOLoop of the handler.
+
+        This is called by the event bus from the publishing thread.
+
+        :param dict event: The event
+        '''
+        self.loop.add_callback(self.put, event)
+
+    def put(self, event):
+        '''
+        Put an event in the queue, or drop it when the client is too slow.
+
+        :param dict event: The event
+        '''
+        try:
+            self.queue.put_nowait(event)
+        except QueueFull:
+            LOGGER.warning('Event queue of client %s is full, dropping event', self.request.remote_ip)
+
+    def on_connection_close(self):
+        '''
+        Unsubscribe from the events when the client has disconnected, and
+        end the stream.
+
+        The queued events can't be delivered anymore, thus they're dropped
+        when the queue is full, to make room for the end of the stream.
+        '''
+        EVENTS.unsubscribe(self.enqueue)
+
+        while self.queue.full():
+            self.queue.get_nowait()
+
+        self.queue.put_nowait(None)
+
+    async def get(self, *args, **kwargs):  # pylint: disable=unused-argument
+        '''
+        Handle GET request.
+
+        :param list \\*args: The positional arguments
+        :param dict \\**kwargs: The keyword arguments
+        '''
+        self.set_header('Content-type', 'text/event-stream')
+        self.set_header('Cache-Control', 'no-cache')
+
+        EVENTS.subscribe(self.enqueue)
+
+        try:
+            self.write('retry: 3000\n\n')
+            await self.flush()
+
+            while True:
+                event = await self.queue.get()
+
+                if event is None:
+                    break
+
+                self.write(f'event: {event["type"]}\ndata: {dumps(event["data"])}\n\n')
+                await self.flush()
+
+        except StreamClosedError:
+            pass
+
+        finally:
+            EVENTS.unsubscribe(self.enqueue)
+
+
+class HistoryHandler(RequestHandler):  # pylint: disable=too-few-public-methods,abstract-method
+    '''
+    Request handler which returns the recent scan events.
+
+    The events can be limited to a time range via the ``since`` and ``until``
+    timestamps, and to the most recent ones via ``limit``.
+    '''
+
+    def get(self, *args, **kwargs):  # pylint: disable=unused-argument
+        '''
+        Handle GET request.
+
+        :param list \\*args: The positional arguments
+        :param dict \\**kwargs: The keyword arguments
+        '''
+        self.set_header('Content-type', 'application/json')
+
+        try:
+            since = self.get_argument('since', None)
+            until = self.get_argument('until', None)
+            limit = self.get_argument('limit', None)
+
+            events = HISTORY.query(
+                since=float(since) if since is not None else None,
+                until=float(until) if until is not None else None,
+                limit=max(int(limit), 0) if limit is not None else None,
+            )
+
+        except ValueError:
+            self.set_status(400)
+            self.write(dumps({
+                'success': False,
+                'message': 'Since, until and limit have to be numbers',
+            }))
+            return
+
+        data = {
+            'success': True,
+            'message': 'History successfully retreived',
+            'size': HISTORY.size,
+            'total': HISTORY.total,
+            'events': [event.as_dict() for event in events],
+        }
+
+        self.write(dumps(data))
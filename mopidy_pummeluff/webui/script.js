@@ -4,6 +4,7 @@
 
 const defaultAction = 'Tracklist'
 let latestTag       = null
+let actionClasses   = {}
 
 
 /**
@@ -44,16 +45,101 @@ const requestApi = (endpoint, data) => {
 }
 
 /**
- * Refresh the registry.
+ * Update the parameter field according to the selected action.
+ */
+
+const updateParameter = () => {
+    const input     = document.getElementById('parameter')
+    const action    = actionClasses[document.getElementById('action').value]
+    const parameter = action ? action.parameter : null
+
+    input.disabled = !parameter
+
+    if(!parameter)
+        input.placeholder = 'No parameter'
+    else if(!parameter.required)
+        input.placeholder = `The ${parameter.name} (${parameter.schema.type}, default ${parameter.default})`
+    else
+        input.placeholder = `The ${parameter.name} (${parameter.schema.type}, required)`
+}
+
+/**
+ * Validate a parameter value against the schema of an action parameter,
+ * which mirrors the validation of the server.
+ */
+
+const validateValue = (value, schema) => {
+    value = value.trim()
+
+    switch(schema.type) {
+        case 'int': {
+            const number = Number(value)
+            if(!/^[+-]?\d+$/.test(value) || number < schema.minimum || number > schema.maximum)
+                return `${schema.label} has to be a number between ${schema.minimum} and ${schema.maximum}`
+            break
+        }
+        case 'uri':
+            if(!new RegExp(schema.pattern).test(value))
+                return `"${value}" is not a valid URI`
+            break
+        case 'enum':
+            if(!schema.choices.includes(value))
+                return `Parameter has to be one of ${schema.choices.join(', ')}`
+            break
+        case 'list': {
+            const items = value.split(schema.separator).filter(item => item.trim())
+            const label = schema.label.toLowerCase()
+            if(!items.length)
+                return `Parameter requires at least one ${label}`
+            if(schema.maximum !== null && items.length > schema.maximum)
+                return `Parameter can't have more than ${schema.maximum} ${label}s`
+            for(const [index, item] of items.entries()) {
+                const error = validateValue(item, schema.item)
+                if(error)
+                    return `${schema.label} ${index + 1}: ${error}`
+            }
+            break
+        }
+        case 'action': {
+            const [name, ...parameter] = value.split(schema.separator)
+            if(!actionClasses[name.trim()])
+                return `Action ${name.trim()} not existing`
+            return validateParameter(name.trim(), parameter.join(schema.separator))
+        }
+    }
+
+    return null
+}
+
+/**
+ * Validate the parameter of an action.
+ */
+
+const validateParameter = (action, value) => {
+    const {parameter} = actionClasses[action] || {}
+
+    if(!parameter)
+        return value.trim() ? 'No parameter allowed for this tag' : null
+
+    if(!value.trim())
+        return parameter.required ? 'Parameter required for this tag' : null
+
+    return validateValue(value, parameter.schema)
+}
+
+/**
+ * Refresh the action classes.
  */
 
 const refreshActionClasses = () => {
     requestApi('/pummeluff/actions/').then(response => {
         const select = document.getElementById('action')
         select.options.length = 0
-        for(const [action, description] of Object.entries(response.actions))
+        actionClasses = response.actions
+        for(const [action, {description}] of Object.entries(actionClasses))
             select.appendChild(renderTemplate('action-template', {action, description}))
         select.value = defaultAction
+        updateParameter()
     })
 }
 
@@ -71,28 +157,56 @@ const refreshRegistry = () => {
 }
 
 /**
- * Callback to read the latest tag.
+ * Fill the form with a scanned tag.
  */
 
-const readTag = () => {
-    requestApi('/pummeluff/latest/').then(response => {
-        const {uid, alias, parameter, action, success, scanned} = response
+const fillForm = tag => {
+    const {uid, alias, parameter, action} = tag
 
-        if(!latestTag)
-            latestTag = response
+    document.getElementById('uid').value       = uid
+    document.getElementById('alias').value     = alias ? alias : ''
+    document.getElementById('parameter').value = parameter ? parameter : ''
+    document.getElementById('action').value    = action !== 'Action' ? action : defaultAction
+    updateParameter()
+}
 
-        if(!success || (success && scanned === latestTag.scanned))
-            return
+/**
+ * Callback to read the latest tag via long-polling.
+ */
+
+const readTag = () => {
+    const query = latestTag ? `?since=${latestTag.scanned || 0}` : ''
+
+    return requestApi(`/pummeluff/latest/${query}`).then(response => {
+        const {success, scanned} = response
 
-        document.getElementById('uid').value       = uid
-        document.getElementById('alias').value     = alias ? alias : ''
-        document.getElementById('parameter').value = parameter ? parameter : ''
-        document.getElementById('action').value    = action !== 'Action' ? action : defaultAction
+        if(latestTag && success && scanned !== latestTag.scanned)
+            fillForm(response)
 
         latestTag = response
     })
 }
 
+/**
+ * Listen for scanned tags via server-sent events, or long-poll the latest
+ * tag when the browser doesn't support them.
+ */
+
+const listenTags = () => {
+    if(!window.EventSource) {
+        const retryInterval = 1000
+        const pollTag       = () => readTag().then(pollTag, () => setTimeout(pollTag, retryInterval))
+        pollTag()
+        return
+    }
+
+    const events = new EventSource('/pummeluff/events/')
+    events.addEventListener('scan', event => {
+        latestTag = JSON.parse(event.data)
+        fillForm(latestTag)
+    })
+}
+
 /**
  * Submit form.
  */
@@ -100,10 +214,19 @@ const readTag = () => {
 const submitForm = event => {
     event.preventDefault()
 
-    const data = new FormData(event.target)
+    const data  = new FormData(event.target)
+    const error = document.getElementById('error')
+
+    if(event.submitter.id === 'register') {
+        const message = validateParameter(data.get('action'), data.get('parameter') || '')
+        error.hidden  = !message
+        if(message) {
+            error.textContent = message
+            return
+        }
+    }
 
     requestApi(`/pummeluff/${event.submitter.id}/`, data).then(response => {
-        const error  = document.getElementById('error')
         error.hidden = response.success
         if(!response.success) {
             error.textContent = response.message
@@ -127,9 +250,8 @@ document.addEventListener('DOMContentLoaded', () => {
     refreshActionClasses()
     refreshRegistry()
 
-    const readTagInterval = 1000
-    readTag()
-    setInterval(readTag, readTagInterval)
+    listenTags()
 
     document.querySelector('form').addEventListener('submit', submitForm)
+    document.getElementById('action').addEventListener('change', updateParameter)
 })